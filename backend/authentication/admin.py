@@ -59,6 +59,9 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_filter: list[str] = ['is_verified', 'created_at', 'updated_at']
     search_fields: list[str] = ['user__username', 'user__email', 'user__first_name', 'user__last_name']
     readonly_fields: list[str] = ['created_at', 'updated_at', 'full_name']
+    list_select_related: list[str] = ['user']
+    autocomplete_fields: list[str] = ['user']
+    ordering: list[str] = ['-created_at']
     
     fieldsets: tuple = (
         ('User Information', {
@@ -75,19 +78,6 @@ class UserProfileAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
-    
-    def full_name(self, obj: UserProfile) -> str:
-        """
-        Get the full name of the user.
-        
-        Args:
-            obj: UserProfile instance
-            
-        Returns:
-            User's full name
-        """
-        return obj.full_name
-    full_name.short_description = 'Full Name'
 
 
 @admin.register(LoginAttempt)
@@ -104,6 +94,7 @@ class LoginAttemptAdmin(admin.ModelAdmin):
     list_filter: list[str] = ['success', 'timestamp']
     search_fields: list[str] = ['username', 'ip_address']
     readonly_fields: list[str] = ['timestamp']
+    ordering: list[str] = ['-timestamp']
     
     fieldsets: tuple = (
         ('Login Information', {
@@ -154,15 +145,18 @@ class PasswordResetTokenAdmin(admin.ModelAdmin):
     """
     
     list_display: list[str] = [
-        'user', 'token', 'is_used', 'is_expired', 'created_at', 'expires_at'
+        'user', 'token_fingerprint', 'is_used', 'is_expired', 'created_at', 'expires_at'
     ]
     list_filter: list[str] = ['is_used', 'created_at', 'expires_at']
-    search_fields: list[str] = ['user__username', 'user__email', 'token']
-    readonly_fields: list[str] = ['created_at', 'is_expired', 'is_valid']
+    search_fields: list[str] = ['user__username', 'user__email']
+    readonly_fields: list[str] = ['token_fingerprint', 'created_at', 'is_expired', 'is_valid']
+    list_select_related: list[str] = ['user']
+    autocomplete_fields: list[str] = ['user']
+    ordering: list[str] = ['-created_at']
     
     fieldsets: tuple = (
         ('Token Information', {
-            'fields': ('user', 'token', 'is_used')
+            'fields': ('user', 'token_fingerprint', 'is_used')
         }),
         ('Expiration', {
             'fields': ('expires_at', 'is_expired', 'is_valid')
@@ -173,6 +167,31 @@ class PasswordResetTokenAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        """
+        Get the queryset for the admin views.
+        
+        Args:
+            request: HTTP request object
+            
+        Returns:
+            Token queryset with the related user joined
+        """
+        return super().get_queryset(request).select_related('user')
+    
+    def token_fingerprint(self, obj: PasswordResetToken) -> str:
+        """
+        Show a short hex prefix of the stored token digest.
+        
+        Args:
+            obj: PasswordResetToken instance
+            
+        Returns:
+            First 12 hex characters of the digest
+        """
+        return bytes(obj.token).hex()[:12] if obj.token else ''
+    token_fingerprint.short_description = 'Token'
+    
     def is_expired(self, obj: PasswordResetToken) -> bool:
         """
         Check if token is expired.
@@ -14,6 +14,7 @@ class AuthenticationConfig(AppConfig):
     
     def ready(self) -> None:
         """Initialize app when ready."""
+        import authentication.checks  # noqa: F401
         try:
             import authentication.signals  # noqa: F401
         except ImportError:
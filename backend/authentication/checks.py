@@ -0,0 +1,46 @@
+"""
+System checks for the authentication app.
+"""
+from typing import Any, List
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Cache backends whose entries are private to one process
+PROCESS_LOCAL_CACHE_BACKENDS: frozenset[str] = frozenset({
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+})
+
+
+@register(Tags.caches, deploy=True)
+def check_throttle_cache(app_configs: Any = None, **kwargs: Any) -> List[Warning]:
+    """
+    Warn when the throttle counters cannot be shared between processes.
+
+    DRF throttles keep their counters in the ``default`` cache. With a
+    process-local backend every worker or serverless instance counts on
+    its own, so the login, registration and reset limits only hold per
+    process. Local development runs one server, where LocMem is the
+    documented default, so this only runs as a deployment check
+    (``manage.py check --deploy``) and only with ``DEBUG`` off.
+
+    Args:
+        app_configs: App configs being checked, if limited
+        **kwargs: Additional keyword arguments
+
+    Returns:
+        List of warnings, empty when the cache is shared
+    """
+    backend: str = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHE_BACKENDS:
+        return []
+    return [Warning(
+        'Authentication throttles are using a process-local cache.',
+        hint=(
+            'Set REDIS_URL so login, registration and password reset rate '
+            'limits are shared by every worker.'
+        ),
+        obj=backend,
+        id='authentication.W001',
+    )]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.16 on 2026-10-14 19:02
+
+from django.db import migrations, models
+
+
+def backfill_full_name(apps, schema_editor):
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+    profiles = list(UserProfile.objects.select_related('user'))
+    for profile in profiles:
+        user = profile.user
+        profile.full_name = f"{user.first_name} {user.last_name}".strip() or user.username
+    UserProfile.objects.bulk_update(profiles, ['full_name'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_password_reset_token_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='full_name',
+            field=models.CharField(blank=True, db_index=True, help_text='Denormalized display name, kept in sync from the User', max_length=301),
+        ),
+        migrations.RunPython(backfill_full_name, migrations.RunPython.noop),
+    ]
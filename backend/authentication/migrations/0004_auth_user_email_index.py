@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.db import migrations
+
+INDEX_NAME = 'auth_user_email_idx'
+
+
+def create_email_index(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    table = schema_editor.quote_name(User._meta.db_table)
+    column = schema_editor.quote_name(User._meta.get_field('email').column)
+    if schema_editor.connection.vendor == 'postgresql':
+        # CONCURRENTLY avoids holding a write lock on auth_user while building
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} ON {table} ({column})'
+        )
+    else:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON {table} ({column})')
+
+
+def drop_email_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}')
+    else:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('authentication', '0003_userprofile_full_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_index, drop_email_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.16 on 2026-10-14 19:06
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_auth_user_email_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='loginattempt',
+            options={'verbose_name': 'Login Attempt', 'verbose_name_plural': 'Login Attempts'},
+        ),
+        migrations.AlterModelOptions(
+            name='passwordresettoken',
+            options={'verbose_name': 'Password Reset Token', 'verbose_name_plural': 'Password Reset Tokens'},
+        ),
+        migrations.AlterModelOptions(
+            name='userprofile',
+            options={'verbose_name': 'User Profile', 'verbose_name_plural': 'User Profiles'},
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.16 on 2026-10-14 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0005_drop_default_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='avatar_md',
+            field=models.CharField(blank=True, editable=False, help_text='URL of the pre-rendered medium avatar', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='avatar_sm',
+            field=models.CharField(blank=True, editable=False, help_text='URL of the pre-rendered small avatar', max_length=255),
+        ),
+    ]
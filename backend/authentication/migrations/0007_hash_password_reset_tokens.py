@@ -0,0 +1,63 @@
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_tokens(apps, schema_editor):
+    PasswordResetToken = apps.get_model('authentication', 'PasswordResetToken')
+    tokens = list(PasswordResetToken.objects.only('id', 'token'))
+    for reset_token in tokens:
+        reset_token.token_digest = hashlib.sha256(reset_token.token.encode('utf-8')).digest()
+    PasswordResetToken.objects.bulk_update(tokens, ['token_digest'], batch_size=500)
+
+
+def delete_outstanding_tokens(apps, schema_editor):
+    # Digests cannot be turned back into tokens; reset links must be re-requested
+    apps.get_model('authentication', 'PasswordResetToken').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0006_userprofile_avatar_variants'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='passwordresettoken',
+            name='authenticat_token_3288c7_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='passwordresettoken',
+            name='prt_active_token',
+        ),
+        migrations.AddField(
+            model_name='passwordresettoken',
+            name='token_digest',
+            field=models.BinaryField(max_length=32, null=True),
+        ),
+        migrations.RunPython(hash_existing_tokens, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='passwordresettoken',
+            name='token',
+        ),
+        migrations.RunPython(migrations.RunPython.noop, delete_outstanding_tokens),
+        migrations.RenameField(
+            model_name='passwordresettoken',
+            old_name='token_digest',
+            new_name='token',
+        ),
+        migrations.AlterField(
+            model_name='passwordresettoken',
+            name='token',
+            field=models.BinaryField(help_text='SHA-256 digest of the emailed reset token', max_length=32, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(fields=['token'], name='authenticat_token_3288c7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(condition=models.Q(('is_used', False)), fields=['token'], name='prt_active_token'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.16 on 2026-10-14 19:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0007_hash_password_reset_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='profile_cache',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Serialized profile payload, rebuilt whenever the profile or user changes'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def create_missing_profiles(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+    users = User.objects.filter(profile__isnull=True).only('first_name', 'last_name', 'username')
+    UserProfile.objects.bulk_create(
+        [
+            UserProfile(
+                user=user,
+                full_name=f"{user.first_name} {user.last_name}".strip() or user.username,
+            )
+            for user in users.iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0008_userprofile_profile_cache'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.16 on 2026-10-14 19:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0009_create_missing_profiles'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='passwordresettoken',
+            name='authenticat_token_3288c7_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='passwordresettoken',
+            name='prt_active_token',
+        ),
+        migrations.AlterField(
+            model_name='passwordresettoken',
+            name='user',
+            field=models.ForeignKey(db_index=False, help_text='User requesting password reset', on_delete=django.db.models.deletion.CASCADE, related_name='password_reset_tokens', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.16 on 2026-10-14 19:37
+
+import hashlib
+import io
+import logging
+import os
+
+from django.core.files.base import ContentFile
+from django.db import migrations, models
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Frozen copy of authentication.services.avatars as of this migration, so
+# later changes to the service cannot change what this migration does
+VARIANT_SIZES = {'sm': 64, 'md': 256}
+
+
+def render_variants(profile):
+    avatar = profile.avatar
+    storage = avatar.storage
+    with avatar.open('rb') as handle:
+        image = Image.open(handle)
+        image.load()
+
+    image_format = image.format or 'PNG'
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    ext = os.path.splitext(avatar.name)[1] or '.png'
+    digest = hashlib.sha256(avatar.name.encode('utf-8')).hexdigest()[:12]
+
+    names = {}
+    for suffix, size in VARIANT_SIZES.items():
+        variant = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        variant.save(buffer, format=image_format)
+        name = f'avatars/variants/{profile.pk}/{digest}_{suffix}{ext}'
+        names[f'avatar_{suffix}'] = storage.save(name, ContentFile(buffer.getvalue()))
+    return names
+
+
+def rerender_avatar_variants(apps, schema_editor):
+    # Variants used to be stored as URLs next to the uploads, where they
+    # could collide with another user's file, so render fresh copies into
+    # each profile's own directory and record their names instead. The
+    # snapshot is cleared and rebuilt on the profile's next save.
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+    profiles = UserProfile.objects.exclude(avatar_sm='', avatar_md='').only('avatar')
+    for profile in profiles.iterator():
+        variants = {'avatar_sm': '', 'avatar_md': ''}
+        if profile.avatar:
+            try:
+                variants = render_variants(profile)
+            except Exception as e:
+                logger.error(f"Failed to render avatar variants for profile {profile.pk}: {e}")
+        UserProfile.objects.filter(pk=profile.pk).update(profile_cache={}, **variants)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0010_drop_redundant_token_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='avatar_md',
+            field=models.CharField(blank=True, editable=False, help_text='Storage name of the pre-rendered medium avatar', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='avatar_sm',
+            field=models.CharField(blank=True, editable=False, help_text='Storage name of the pre-rendered small avatar', max_length=255),
+        ),
+        migrations.RunPython(rerender_avatar_variants, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.16 on 2026-10-14 23:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0011_avatar_variant_names'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='loginattempt',
+            name='ip_address',
+            field=models.GenericIPAddressField(blank=True, help_text='IP address of the login attempt, if the request had a valid one', null=True),
+        ),
+    ]
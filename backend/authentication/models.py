@@ -1,6 +1,8 @@
 """
 Authentication models for Kwantum Institute.
 """
+import hashlib
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.contrib.auth.validators import UnicodeUsernameValidator
@@ -8,6 +10,22 @@ from django.core.validators import EmailValidator
 from django.utils import timezone
 from typing import Optional
 
+# Shared validator instance; its regex is compiled once at import
+_USERNAME_VALIDATOR: UnicodeUsernameValidator = UnicodeUsernameValidator()
+
+
+class UserProfileManager(models.Manager):
+    """
+    Default manager for UserProfile.
+
+    Joins the related User up front, since nearly every consumer of a
+    profile (serializers, admin, ``__str__``) reads user fields too.
+    """
+
+    def get_queryset(self) -> models.QuerySet:
+        """Return profiles with their User fetched in the same query."""
+        return super().get_queryset().select_related('user')
+
 
 class UserProfile(models.Model):
     """
@@ -36,6 +54,20 @@ class UserProfile(models.Model):
         help_text="User's profile picture"
     )
     
+    avatar_sm: str = models.CharField(
+        max_length=255,
+        blank=True,
+        editable=False,
+        help_text="Storage name of the pre-rendered small avatar"
+    )
+    
+    avatar_md: str = models.CharField(
+        max_length=255,
+        blank=True,
+        editable=False,
+        help_text="Storage name of the pre-rendered medium avatar"
+    )
+    
     date_of_birth: Optional[models.DateField] = models.DateField(
         blank=True, 
         null=True,
@@ -53,6 +85,20 @@ class UserProfile(models.Model):
         help_text="Whether the user's email has been verified"
     )
     
+    full_name: str = models.CharField(
+        max_length=301,
+        blank=True,
+        db_index=True,
+        help_text="Denormalized display name, kept in sync from the User"
+    )
+    
+    profile_cache: dict = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Serialized profile payload, rebuilt whenever the profile or user changes"
+    )
+    
     created_at: models.DateTimeField = models.DateTimeField(
         auto_now_add=True,
         help_text="When the profile was created"
@@ -63,20 +109,29 @@ class UserProfile(models.Model):
         help_text="When the profile was last updated"
     )
     
+    objects: UserProfileManager = UserProfileManager()
+
     class Meta:
         """Meta options for UserProfile model."""
         verbose_name: str = "User Profile"
         verbose_name_plural: str = "User Profiles"
-        ordering: list[str] = ['-created_at']
     
     def __str__(self) -> str:
         """String representation of the user profile."""
         return f"Profile for {self.user.username}"
     
-    @property
-    def full_name(self) -> str:
-        """Get the user's full name."""
-        return f"{self.user.first_name} {self.user.last_name}".strip() or self.user.username
+    @staticmethod
+    def build_full_name(user: User) -> str:
+        """
+        Compute the display name stored in ``full_name``.
+
+        Args:
+            user: User whose name fields should be combined
+
+        Returns:
+            "First Last", falling back to the username when both are blank
+        """
+        return f"{user.first_name} {user.last_name}".strip() or user.username
 
 
 class LoginAttempt(models.Model):
@@ -89,12 +144,14 @@ class LoginAttempt(models.Model):
     
     username: str = models.CharField(
         max_length=150,
-        validators=[UnicodeUsernameValidator()],
+        validators=[_USERNAME_VALIDATOR],
         help_text="Username used in the login attempt"
     )
     
-    ip_address: str = models.GenericIPAddressField(
-        help_text="IP address of the login attempt"
+    ip_address: Optional[str] = models.GenericIPAddressField(
+        blank=True,
+        null=True,
+        help_text="IP address of the login attempt, if the request had a valid one"
     )
     
     user_agent: str = models.TextField(
@@ -116,7 +173,6 @@ class LoginAttempt(models.Model):
         """Meta options for LoginAttempt model."""
         verbose_name: str = "Login Attempt"
         verbose_name_plural: str = "Login Attempts"
-        ordering: list[str] = ['-timestamp']
         indexes: list[models.Index] = [
             models.Index(fields=['username', 'timestamp']),
             models.Index(fields=['ip_address', 'timestamp']),
@@ -140,13 +196,14 @@ class PasswordResetToken(models.Model):
         User,
         on_delete=models.CASCADE,
         related_name='password_reset_tokens',
+        db_index=False,
         help_text="User requesting password reset"
     )
     
-    token: str = models.CharField(
-        max_length=100,
+    token: bytes = models.BinaryField(
+        max_length=32,
         unique=True,
-        help_text="Unique token for password reset"
+        help_text="SHA-256 digest of the emailed reset token"
     )
     
     is_used: bool = models.BooleanField(
@@ -167,16 +224,33 @@ class PasswordResetToken(models.Model):
         """Meta options for PasswordResetToken model."""
         verbose_name: str = "Password Reset Token"
         verbose_name_plural: str = "Password Reset Tokens"
-        ordering: list[str] = ['-created_at']
+        # ``token`` lookups use its unique index and ``user`` lookups the
+        # leading column of (user, is_used), so neither gets its own index
         indexes: list[models.Index] = [
-            models.Index(fields=['token']),
             models.Index(fields=['user', 'is_used']),
+            models.Index(fields=['expires_at']),
         ]
     
     def __str__(self) -> str:
         """String representation of the password reset token."""
         return f"Password reset token for {self.user.username}"
     
+    @staticmethod
+    def hash_token(raw_token: str) -> bytes:
+        """
+        Digest a reset token for storage and lookup.
+        
+        Only the digest is persisted, so a database dump cannot be replayed
+        as reset links, and the indexed key has a fixed 32-byte width.
+        
+        Args:
+            raw_token: Token as sent in the reset link
+            
+        Returns:
+            32-byte SHA-256 digest
+        """
+        return hashlib.sha256(raw_token.encode('utf-8')).digest()
+    
     @property
     def is_expired(self) -> bool:
         """Check if the token has expired."""
@@ -2,10 +2,19 @@
 Serializers for authentication API endpoints.
 """
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
+from django.contrib.auth.password_validation import validate_password
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from typing import Dict, Any, Optional
+from django.core.files.storage import Storage
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from collections.abc import Mapping
+from hashlib import sha256
+from typing import Dict, Any, Optional, Tuple
 from .models import UserProfile, LoginAttempt, PasswordResetToken
 
 
@@ -26,83 +35,193 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields: list[str] = ['id', 'date_joined']
 
 
+def user_cache_key(user_id: int) -> str:
+    """
+    Build the cache key for a user's serialized payload.
+    
+    Args:
+        user_id: Primary key of the user
+        
+    Returns:
+        Cache key string
+    """
+    return f"authentication:user:v1:{user_id}"
+
+
+def serialize_user(user: User) -> Dict[str, Any]:
+    """
+    Get ``UserSerializer`` output through the cache.
+    
+    Entries are dropped by the User ``post_save`` receiver whenever a
+    serialized field may have changed, so the TTL only bounds memory.
+    
+    Args:
+        user: User to serialize
+        
+    Returns:
+        The serialized user as a plain dict
+    """
+    return cache.get_or_set(
+        user_cache_key(user.pk),
+        lambda: dict(UserSerializer(user).data),
+        timeout=int(getattr(settings, 'USER_CACHE_TTL', 60)),
+    )
+
+
+class StoredFileURLField(serializers.ReadOnlyField):
+    """
+    Render a storage name held in a plain column as a file URL.
+    
+    Mirrors DRF's ``FileField`` output: absolute when the serializer has
+    a request in its context, the storage's own URL otherwise.
+    """
+    
+    def __init__(self, storage: Storage, **kwargs: Any) -> None:
+        """
+        Initialize the field.
+        
+        Args:
+            storage: Storage backend holding the files
+            **kwargs: Passed to ``ReadOnlyField``
+        """
+        self.storage = storage
+        super().__init__(**kwargs)
+    
+    def to_representation(self, value: str) -> str:
+        """
+        Convert a storage name to its URL.
+        
+        Args:
+            value: Storage name, or blank when there is no file
+            
+        Returns:
+            File URL, or an empty string
+        """
+        if not value:
+            return ''
+        url: str = self.storage.url(value)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     """
     Serializer for UserProfile model.
     
     Includes nested user data and handles profile-specific fields.
+    Querysets passed in should come from ``UserProfile.objects``, which
+    joins the related User, so the nested ``user`` field does not issue
+    one extra query per profile. ``full_name`` is a stored column.
     """
     
     user: UserSerializer = UserSerializer(read_only=True)
     full_name: str = serializers.CharField(read_only=True)
+    avatar_sm: str = StoredFileURLField(UserProfile._meta.get_field('avatar').storage)
+    avatar_md: str = StoredFileURLField(UserProfile._meta.get_field('avatar').storage)
     
     class Meta:
         """Meta configuration for UserProfileSerializer."""
         model: type[UserProfile] = UserProfile
         fields: list[str] = [
-            'id', 'user', 'bio', 'avatar', 'date_of_birth',
-            'phone_number', 'is_verified', 'created_at', 
+            'id', 'user', 'bio', 'avatar', 'avatar_sm', 'avatar_md',
+            'date_of_birth', 'phone_number', 'is_verified', 'created_at', 
             'updated_at', 'full_name'
         ]
-        read_only_fields: list[str] = ['id', 'created_at', 'updated_at', 'full_name']
+        read_only_fields: list[str] = [
+            'id', 'avatar_sm', 'avatar_md', 'created_at', 'updated_at', 'full_name'
+        ]
+
+
+# UserProfileSerializer fields holding file URLs, which are absolute only
+# when rendered with a request, so they stay out of the stored snapshot
+PROFILE_FILE_FIELDS: tuple[str, ...] = ('avatar', 'avatar_sm', 'avatar_md')
 
 
-class LoginSerializer(serializers.Serializer):
+class UserProfileFilesSerializer(UserProfileSerializer):
     """
-    Serializer for user login.
+    Serializer for the file URL fields of a UserProfile.
     
-    Handles username/password authentication and returns user data.
+    Rendered per request on top of ``UserProfile.profile_cache``.
     """
     
-    username: str = serializers.CharField(
-        max_length=150,
-        help_text="Username for authentication"
-    )
-    password: str = serializers.CharField(
-        max_length=128,
-        write_only=True,
-        help_text="Password for authentication"
-    )
+    class Meta(UserProfileSerializer.Meta):
+        """Meta configuration for UserProfileFilesSerializer."""
+        fields: list[str] = list(PROFILE_FILE_FIELDS)
+
+
+# Bump when a field's representation changes without a field list changing
+PROFILE_SNAPSHOT_REVISION: int = 1
+
+# Stored with each ``UserProfile.profile_cache`` snapshot; a snapshot with
+# any other version was built for an older payload shape and is not served
+PROFILE_SNAPSHOT_VERSION: str = '{}:{}'.format(
+    PROFILE_SNAPSHOT_REVISION,
+    sha256(repr((
+        UserProfileSerializer.Meta.fields,
+        UserSerializer.Meta.fields,
+    )).encode()).hexdigest()[:12],
+)
+
+
+# (field name, max length) pairs accepted by the login endpoint
+LOGIN_FIELDS: tuple[tuple[str, int], ...] = (('username', 150), ('password', 128))
+
+
+def validate_login(data: Mapping[str, Any]) -> Tuple[Optional[User], Dict[str, list[str]]]:
+    """
+    Validate login credentials.
     
-    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Validate login credentials.
-        
-        Args:
-            attrs: Dictionary containing username and password
-            
-        Returns:
-            Dictionary with validated data
-            
-        Raises:
-            ValidationError: If credentials are invalid
-        """
-        username: str = attrs.get('username')
-        password: str = attrs.get('password')
+    Login has two scalar fields, so this replaces a DRF serializer to skip
+    the per-request field deep-copy. Field checks mirror ``CharField``
+    (required, non-blank, trimmed, max length) and errors use the same
+    shape as ``serializer.errors``, including the ``non_field_errors``
+    message ``Serializer.is_valid`` gives a body that is not an object.
+    Repeated failures are limited before this runs, by the login view's
+    throttles.
+    
+    Args:
+        data: Request payload, expected to hold username and password
         
-        if username and password:
-            user: Optional[User] = authenticate(
-                username=username, 
-                password=password
-            )
-            
-            if not user:
-                raise ValidationError(
-                    "Invalid username or password."
-                )
-            
-            if not user.is_active:
-                raise ValidationError(
-                    "User account is disabled."
-                )
-            
-            attrs['user'] = user
+    Returns:
+        Tuple of the authenticated user (None on failure) and an errors
+        dictionary (empty on success)
+    """
+    if not isinstance(data, Mapping):
+        return None, {'non_field_errors': [
+            f"Invalid data. Expected a dictionary, but got {type(data).__name__}."
+        ]}
+    
+    values: Dict[str, str] = {}
+    errors: Dict[str, list[str]] = {}
+    
+    for field, max_length in LOGIN_FIELDS:
+        value: Any = data.get(field)
+        if value is None:
+            errors[field] = ["This field is required."]
+        elif not isinstance(value, (str, int, float)) or isinstance(value, bool):
+            errors[field] = ["Not a valid string."]
+        elif not str(value).strip():
+            errors[field] = ["This field may not be blank."]
+        elif len(str(value).strip()) > max_length:
+            errors[field] = [f"Ensure this field has no more than {max_length} characters."]
         else:
-            raise ValidationError(
-                "Must include 'username' and 'password'."
-            )
-        
-        return attrs
+            values[field] = str(value).strip()
+    
+    if errors:
+        return None, errors
+    
+    user: Optional[User] = authenticate(
+        username=values['username'],
+        password=values['password']
+    )
+    
+    if not user:
+        return None, {'non_field_errors': ["Invalid username or password."]}
+    
+    if not user.is_active:
+        return None, {'non_field_errors': ["User account is disabled."]}
+    
+    return user, {}
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -110,8 +229,21 @@ class RegisterSerializer(serializers.ModelSerializer):
     Serializer for user registration.
     
     Handles new user creation with validation and profile creation.
+    Username uniqueness comes from the UniqueValidator ModelSerializer
+    derives from ``User.username``; email gets an explicit one since
+    ``auth_user.email`` is not unique at the database level.
     """
     
+    email: str = serializers.EmailField(
+        max_length=254,
+        required=False,
+        allow_blank=True,
+        validators=[UniqueValidator(
+            queryset=User.objects.all(),
+            message="Email already exists."
+        )],
+        help_text="Email address for the new account"
+    )
     password: str = serializers.CharField(
         max_length=128,
         write_only=True,
@@ -152,19 +284,17 @@ class RegisterSerializer(serializers.ModelSerializer):
                 "Passwords do not match."
             )
         
-        # Check if username already exists
-        username: str = attrs.get('username')
-        if User.objects.filter(username=username).exists():
-            raise ValidationError(
-                "Username already exists."
-            )
-        
-        # Check if email already exists
-        email: str = attrs.get('email')
-        if User.objects.filter(email=email).exists():
-            raise ValidationError(
-                "Email already exists."
-            )
+        # Unsaved user so UserAttributeSimilarityValidator can compare fields
+        candidate: User = User(
+            username=attrs.get('username', ''),
+            email=attrs.get('email', ''),
+            first_name=attrs.get('first_name', ''),
+            last_name=attrs.get('last_name', '')
+        )
+        try:
+            validate_password(password, user=candidate)
+        except ValidationError as e:
+            raise ValidationError({'password': e.messages})
         
         return attrs
     
@@ -180,10 +310,29 @@ class RegisterSerializer(serializers.ModelSerializer):
         """
         # Remove password_confirm from validated_data
         validated_data.pop('password_confirm', None)
-        
-        # Create user (UserProfile will be created automatically by signal)
-        user: User = User.objects.create_user(**validated_data)
-        
+        password: str = validated_data.pop('password')
+
+        # Mirror UserManager.create_user, but create the profile explicitly
+        # so the post_save signal does not race us for the same INSERT
+        validated_data['username'] = User.normalize_username(validated_data['username'])
+        validated_data['email'] = User.objects.normalize_email(validated_data.get('email', ''))
+        user: User = User(**validated_data)
+        user.set_password(password)
+        user._skip_profile_signal = True
+
+        try:
+            with transaction.atomic():
+                user.save()
+                UserProfile.objects.create(
+                    user=user,
+                    full_name=UserProfile.build_full_name(user)
+                )
+        except IntegrityError:
+            # Lost a race with a concurrent signup for the same username
+            raise serializers.ValidationError({
+                'username': ["A user with that username already exists."]
+            })
+
         return user
 
 
@@ -231,6 +380,11 @@ class PasswordChangeSerializer(serializers.Serializer):
                 "New passwords do not match."
             )
         
+        try:
+            validate_password(new_password, user=self.context['request'].user)
+        except ValidationError as e:
+            raise ValidationError({'new_password': e.messages})
+        
         return attrs
     
     def validate_old_password(self, value: str) -> str:
@@ -267,25 +421,12 @@ class PasswordResetRequestSerializer(serializers.Serializer):
         help_text="Email address for password reset"
     )
     
-    def validate_email(self, value: str) -> str:
-        """
-        Validate that the email exists in the system.
-        
-        Args:
-            value: Email address
-            
-        Returns:
-            Validated email address
-            
-        Raises:
-            ValidationError: If email doesn't exist
-        """
-        if not User.objects.filter(email=value, is_active=True).exists():
-            raise ValidationError(
-                "No active user found with this email address."
-            )
-        
-        return value
+    # No existence check here: PasswordResetRequestView answers unknown
+    # addresses exactly like known ones so accounts cannot be enumerated
+
+
+# Error for unknown, used or expired reset tokens
+PASSWORD_RESET_TOKEN_INVALID: str = "Token is invalid or has expired."
 
 
 class PasswordResetConfirmSerializer(serializers.Serializer):
@@ -331,34 +472,34 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
                 "Passwords do not match."
             )
         
+        try:
+            validate_password(new_password, user=attrs['token'].user)
+        except ValidationError as e:
+            raise ValidationError({'new_password': e.messages})
+        
         return attrs
     
-    def validate_token(self, value: str) -> str:
+    def validate_token(self, value: str) -> PasswordResetToken:
         """
         Validate that the token is valid and not expired.
         
+        The matching row is returned with its user joined, so the view
+        can reset the password without querying again.
+        
         Args:
             value: Token value
             
         Returns:
-            Validated token
+            The unused, unexpired PasswordResetToken
             
         Raises:
             ValidationError: If token is invalid or expired
         """
         try:
-            token_obj: PasswordResetToken = PasswordResetToken.objects.get(
-                token=value
+            return PasswordResetToken.objects.select_related('user').get(
+                token=PasswordResetToken.hash_token(value),
+                is_used=False,
+                expires_at__gt=timezone.now(),
             )
-            
-            if not token_obj.is_valid:
-                raise ValidationError(
-                    "Token is invalid or has expired."
-                )
-            
         except PasswordResetToken.DoesNotExist:
-            raise ValidationError(
-                "Invalid token."
-            )
-        
-        return value 
\ No newline at end of file
+            raise ValidationError(PASSWORD_RESET_TOKEN_INVALID)
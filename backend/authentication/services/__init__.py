@@ -0,0 +1,24 @@
+"""Service layer for the authentication app."""
+
+from .avatars import delete_avatar_variants, render_avatar_variants, variant_prefix
+from .login_attempt_buffer import LoginAttemptBuffer, login_attempt_buffer
+from .mail import MailQueue, mail_queue, send_password_reset_email
+from .password_reset import (
+    issue_password_reset,
+    pad_password_reset_response,
+    request_password_reset,
+)
+
+__all__ = [
+    "LoginAttemptBuffer",
+    "MailQueue",
+    "delete_avatar_variants",
+    "issue_password_reset",
+    "login_attempt_buffer",
+    "mail_queue",
+    "pad_password_reset_response",
+    "render_avatar_variants",
+    "request_password_reset",
+    "send_password_reset_email",
+    "variant_prefix",
+]
@@ -0,0 +1,97 @@
+"""Pre-rendered avatar variants for user profiles."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+from typing import Iterable
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Variant suffix -> square edge length in pixels
+AVATAR_VARIANT_SIZES: dict[str, int] = {"sm": 64, "md": 256}
+
+
+def variant_dir(profile_pk: int) -> str:
+    """Build the storage directory holding one profile's variants.
+
+    Variants live apart from ``avatars/`` uploads, so rendering or
+    cleaning them up can never touch a file another user uploaded.
+
+    Args:
+        profile_pk: Primary key of the owning profile.
+
+    Returns:
+        Directory name such as ``avatars/variants/7/``.
+    """
+    return f"avatars/variants/{profile_pk}/"
+
+
+def variant_prefix(profile_pk: int, source_name: str, suffix: str) -> str:
+    """Build the name prefix of a variant rendered from one upload.
+
+    The prefix carries a fixed-width digest of the upload's storage name,
+    so a stored variant name shows which upload it was rendered from
+    whatever suffix ``storage.save`` appended to keep it unique.
+
+    Args:
+        profile_pk: Primary key of the owning profile.
+        source_name: Storage name of the uploaded avatar.
+        suffix: Variant key from ``AVATAR_VARIANT_SIZES``.
+
+    Returns:
+        Name prefix, e.g. ``avatars/variants/7/3f2a9c0d1e4b_sm``.
+    """
+    digest = hashlib.sha256(source_name.encode("utf-8")).hexdigest()[:12]
+    return f"{variant_dir(profile_pk)}{digest}_{suffix}"
+
+
+def render_avatar_variants(profile) -> dict[str, str]:
+    """Resize a profile's uploaded avatar once and store every variant.
+
+    Args:
+        profile: Saved profile whose ``avatar`` holds an image.
+
+    Returns:
+        Mapping of model field name (``avatar_sm``, ...) to storage name.
+    """
+    avatar = profile.avatar
+    storage = avatar.storage
+    with avatar.open("rb") as handle:
+        image = Image.open(handle)
+        image.load()
+
+    image_format = image.format or "PNG"
+    if image_format == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    ext = os.path.splitext(avatar.name)[1] or ".png"
+
+    names: dict[str, str] = {}
+    for suffix, size in AVATAR_VARIANT_SIZES.items():
+        variant = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        variant.save(buffer, format=image_format)
+
+        # storage.save picks a free name rather than overwriting
+        name = f"{variant_prefix(profile.pk, avatar.name, suffix)}{ext}"
+        names[f"avatar_{suffix}"] = storage.save(name, ContentFile(buffer.getvalue()))
+    return names
+
+
+def delete_avatar_variants(profile_pk: int, names: Iterable[str], storage) -> None:
+    """Delete variant files previously recorded on a profile.
+
+    Names outside the profile's ``variant_dir`` are skipped, so a stale or
+    legacy value never deletes a file the profile does not own.
+
+    Args:
+        profile_pk: Primary key of the owning profile.
+        names: Storage names taken from ``avatar_sm``/``avatar_md``.
+        storage: Storage backend of the ``avatar`` field.
+    """
+    owned = variant_dir(profile_pk)
+    for name in names:
+        if name and name.startswith(owned):
+            storage.delete(name)
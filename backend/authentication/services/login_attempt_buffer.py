@@ -0,0 +1,182 @@
+"""Buffered writer for LoginAttempt audit rows."""
+
+from __future__ import annotations
+
+import atexit
+import ipaddress
+import logging
+import queue
+import threading
+import time
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+
+from ..models import LoginAttempt
+
+logger = logging.getLogger(__name__)
+
+# Longest username LoginAttempt stores; matches its ``max_length``
+USERNAME_MAX_LENGTH: int = LoginAttempt._meta.get_field("username").max_length
+
+
+def normalize_attempt(
+    username: Any,
+    ip_address: Optional[str],
+    **fields: Any,
+) -> dict[str, Any]:
+    """Coerce attempt values into what the LoginAttempt columns accept.
+
+    Rows are written in batches, so one value the database rejects
+    would otherwise cost every attempt sharing its batch.
+
+    Args:
+        username: Username as submitted, possibly not a string.
+        ip_address: Client address, possibly missing or malformed.
+        **fields: Remaining LoginAttempt field values.
+
+    Returns:
+        Field values with the username truncated and a valid IP or None.
+    """
+    try:
+        ip_address = str(ipaddress.ip_address(ip_address))
+    except ValueError:
+        ip_address = None
+    return {
+        "username": str(username)[:USERNAME_MAX_LENGTH],
+        "ip_address": ip_address,
+        **fields,
+    }
+
+
+class LoginAttemptBuffer:
+    """Batch LoginAttempt inserts off the request thread.
+
+    Only active with ``AUTH_BACKGROUND_WORKERS`` enabled; otherwise each
+    attempt is written on the request thread, since a serverless instance
+    may be frozen before a background flush runs. When enabled, attempts
+    are queued in-process as plain field dicts and a daemon thread builds
+    the model instances and writes them with one ``bulk_create`` per
+    batch, so the login response does not wait on the INSERT or pay for
+    model construction. ``bulk_create`` also skips ``save()`` and signal
+    dispatch. Rows are timestamped when flushed, which lags the attempt
+    by at most ``flush_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.5,
+        max_batch: int = 500,
+        max_pending: int = 10_000,
+    ) -> None:
+        """Initialize the buffer.
+
+        Args:
+            flush_interval: Seconds to collect attempts before writing them.
+            max_batch: Maximum rows written per ``bulk_create`` call.
+            max_pending: Queue bound; overflow is written synchronously.
+        """
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        atexit.register(self._flush_quietly)
+
+    def put(self, **fields: Any) -> None:
+        """Queue an attempt for the next batch, or write it now.
+
+        Args:
+            **fields: LoginAttempt field values (username, ip_address, ...).
+        """
+        fields = normalize_attempt(**fields)
+        if not getattr(settings, "AUTH_BACKGROUND_WORKERS", False):
+            LoginAttempt.objects.bulk_create([LoginAttempt(**fields)])
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(fields)
+        except queue.Full:
+            logger.warning("Login attempt buffer full; writing synchronously")
+            LoginAttempt.objects.bulk_create([LoginAttempt(**fields)])
+
+    def flush(self, pending: Optional[list[dict[str, Any]]] = None) -> int:
+        """Write every queued attempt.
+
+        Args:
+            pending: Attempts already taken off the queue by the caller.
+
+        Returns:
+            Number of rows written.
+        """
+        written = 0
+        while True:
+            batch: list[dict[str, Any]] = pending or []
+            pending = None
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return written
+            written += self._write(batch)
+
+    def _write(self, batch: list[dict[str, Any]]) -> int:
+        """Insert one batch, falling back to one row at a time on error.
+
+        Returns:
+            Number of rows written.
+        """
+        try:
+            LoginAttempt.objects.bulk_create(
+                [LoginAttempt(**fields) for fields in batch],
+                batch_size=self.max_batch,
+                ignore_conflicts=True,
+            )
+            return len(batch)
+        except DatabaseError as e:
+            if len(batch) == 1:
+                raise
+            logger.warning(f"Login attempt batch failed, retrying row by row: {e}")
+        written = 0
+        for fields in batch:
+            try:
+                LoginAttempt.objects.bulk_create([LoginAttempt(**fields)])
+                written += 1
+            except DatabaseError as e:
+                logger.error(f"Dropped login attempt for {fields['username']!r}: {e}")
+        return written
+
+    def _ensure_worker(self) -> None:
+        """Start the flush thread on first use."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._run,
+                name="login-attempt-buffer",
+                daemon=True,
+            )
+            self._worker.start()
+
+    def _run(self) -> None:
+        """Block until an attempt arrives, then flush after the interval."""
+        while True:
+            first = self._queue.get()
+            time.sleep(self.flush_interval)
+            self._flush_quietly([first])
+            close_old_connections()
+
+    def _flush_quietly(self, pending: Optional[list[dict[str, Any]]] = None) -> None:
+        """Flush, logging instead of raising so the worker survives."""
+        try:
+            self.flush(pending)
+        except Exception as e:
+            logger.error(f"Failed to flush login attempts: {e}")
+
+
+login_attempt_buffer = LoginAttemptBuffer()
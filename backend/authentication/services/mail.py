@@ -0,0 +1,220 @@
+"""Background delivery of account emails."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.template.loader import render_to_string
+
+logger = logging.getLogger(__name__)
+
+
+class MailQueue:
+    """Send emails once the surrounding transaction commits.
+
+    Mail is never sent for rows that were rolled back. By default each
+    message is sent on the request thread over a fresh connection, since
+    a serverless instance may be frozen as soon as the response is out.
+    With ``AUTH_BACKGROUND_WORKERS`` enabled, messages go to a small
+    worker pool instead; each worker keeps its own email backend
+    connection open between messages, so a burst pays the SMTP handshake
+    once per worker rather than once per email. Failed background sends
+    drop the connection and are retried with exponential backoff, then
+    logged. Queued mail lives only in process memory and is lost if the
+    process dies first.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_attempts: int = 3,
+        retry_backoff: float = 1.0,
+    ) -> None:
+        """Initialize the queue.
+
+        Args:
+            max_workers: Worker threads delivering mail concurrently.
+            max_attempts: Delivery attempts per message before giving up.
+            retry_backoff: Seconds before the first retry; doubles per retry.
+        """
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Backend connections are not thread-safe, so each worker has one
+        self._local = threading.local()
+
+    def send(
+        self,
+        subject: str,
+        message: str,
+        recipient_list: list[str],
+        from_email: Optional[str] = None,
+    ) -> None:
+        """Send a plain-text email once the current transaction commits.
+
+        Args:
+            subject: Email subject line.
+            message: Plain-text body.
+            recipient_list: Addresses to send to.
+            from_email: Sender; defaults to ``DEFAULT_FROM_EMAIL``.
+        """
+        sender = from_email or settings.DEFAULT_FROM_EMAIL
+        if not getattr(settings, "AUTH_BACKGROUND_WORKERS", False):
+            transaction.on_commit(
+                lambda: self._send_now(subject, message, recipient_list, sender)
+            )
+            return
+        transaction.on_commit(
+            lambda: self._get_executor().submit(
+                self._deliver, subject, message, recipient_list, sender
+            )
+        )
+
+    def submit(self, job: Callable[..., None], *args: Any) -> None:
+        """Run a job that sends mail once the current transaction commits.
+
+        Lets callers hand off all of the work behind an email, not just
+        delivery. The job runs on a worker with ``AUTH_BACKGROUND_WORKERS``
+        enabled and on the calling thread otherwise; errors are logged.
+
+        Args:
+            job: Callable doing the work, typically ending in ``send()``.
+            *args: Arguments passed to ``job``.
+        """
+        if not getattr(settings, "AUTH_BACKGROUND_WORKERS", False):
+            transaction.on_commit(lambda: self._run_job(job, args))
+            return
+        transaction.on_commit(
+            lambda: self._get_executor().submit(self._run_job, job, args, background=True)
+        )
+
+    def _run_job(
+        self,
+        job: Callable[..., None],
+        args: tuple[Any, ...],
+        background: bool = False,
+    ) -> None:
+        """Run a submitted job, logging instead of raising."""
+        try:
+            job(*args)
+        except Exception as e:
+            logger.error(f"Mail job {job.__name__} failed: {e}")
+        finally:
+            if background:
+                close_old_connections()
+
+    def _send_now(
+        self,
+        subject: str,
+        message: str,
+        recipient_list: list[str],
+        from_email: str,
+    ) -> None:
+        """Send one message on the calling thread, logging any failure."""
+        try:
+            EmailMessage(
+                subject=subject,
+                body=message,
+                from_email=from_email,
+                to=recipient_list,
+            ).send()
+        except Exception as e:
+            logger.error(f"Failed to send email '{subject}': {e}")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the worker pool on first use."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="mail-queue",
+                    )
+        return self._executor
+
+    def _connection(self) -> tuple[Any, bool]:
+        """Return this worker's open connection and whether it was reused."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection, True
+        connection = get_connection()
+        connection.open()
+        self._local.connection = connection
+        return connection, False
+
+    def _drop_connection(self) -> None:
+        """Close this worker's connection so the next send reconnects."""
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is None:
+            return
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _deliver(
+        self,
+        subject: str,
+        message: str,
+        recipient_list: list[str],
+        from_email: str,
+    ) -> None:
+        """Send one message, retrying transient failures.
+
+        A reused connection that fails was most likely closed by the
+        server while idle, so that retry reconnects without waiting.
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            reused = False
+            try:
+                connection, reused = self._connection()
+                EmailMessage(
+                    subject=subject,
+                    body=message,
+                    from_email=from_email,
+                    to=recipient_list,
+                    connection=connection,
+                ).send()
+                return
+            except Exception as e:
+                self._drop_connection()
+                if attempt == self.max_attempts:
+                    logger.error(f"Failed to send email '{subject}' after {attempt} attempts: {e}")
+                    return
+                logger.warning(f"Email '{subject}' attempt {attempt} failed: {e}")
+                if not reused:
+                    time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+
+
+def send_password_reset_email(email: str, username: str, reset_url: str) -> None:
+    """Send the password reset email for one user after the current commit.
+
+    The body is rendered from ``authentication/emails/password_reset.txt``;
+    Django's cached template loader parses it once per process.
+
+    Args:
+        email: Recipient address.
+        username: Username greeted in the message.
+        reset_url: Frontend link carrying the raw reset token.
+    """
+    mail_queue.send(
+        subject='Password Reset Request - Kwantum Institute',
+        message=render_to_string(
+            'authentication/emails/password_reset.txt',
+            {'username': username, 'reset_url': reset_url},
+        ),
+        recipient_list=[email],
+    )
+
+
+mail_queue = MailQueue()
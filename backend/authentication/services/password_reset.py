@@ -0,0 +1,94 @@
+"""Issuing password reset tokens."""
+
+from __future__ import annotations
+
+import logging
+import secrets
+import time
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from ..models import PasswordResetToken
+from .mail import mail_queue, send_password_reset_email
+
+logger = logging.getLogger(__name__)
+
+# How long an emailed reset link stays valid
+RESET_TOKEN_LIFETIME: timedelta = timedelta(hours=24)
+
+
+def request_password_reset(email: str) -> None:
+    """Start a password reset for ``email`` without revealing the outcome.
+
+    The account lookup, token write and email all run in one mail job,
+    so the request thread does the same work whether or not the address
+    belongs to an account. With ``AUTH_BACKGROUND_WORKERS`` off the job
+    runs inline, so the view pads the response with
+    ``pad_password_reset_response``.
+
+    Args:
+        email: Address submitted to the reset form.
+    """
+    mail_queue.submit(issue_password_reset, email)
+
+
+def pad_password_reset_response(started_at: float) -> None:
+    """Hold an inline reset response until its fixed response time.
+
+    Sleeps until ``PASSWORD_RESET_RESPONSE_TIME`` seconds after
+    ``started_at``, so a request whose job looked up an account, stored a
+    token and talked to SMTP returns at the same moment as one that found
+    nothing. Does nothing with ``AUTH_BACKGROUND_WORKERS`` on, where the
+    job never runs on the request thread, or when the setting is 0.
+
+    Args:
+        started_at: ``time.monotonic()`` reading taken when the request
+            reached the view.
+    """
+    response_time = settings.PASSWORD_RESET_RESPONSE_TIME
+    if settings.AUTH_BACKGROUND_WORKERS or not response_time:
+        return
+    elapsed = time.monotonic() - started_at
+    if elapsed > response_time:
+        logger.warning(
+            f"Password reset took {elapsed:.2f}s, over PASSWORD_RESET_RESPONSE_TIME "
+            f"({response_time}s); its timing may reveal whether the email has an account"
+        )
+        return
+    time.sleep(response_time - elapsed)
+
+
+def issue_password_reset(email: str) -> None:
+    """Replace the reset token of the account behind ``email`` and mail it.
+
+    Unknown and inactive addresses are ignored. Only the token's digest
+    is stored; the raw token goes out in the link.
+
+    Args:
+        email: Address submitted to the reset form.
+    """
+    user = User.objects.only("id", "username", "email").filter(
+        email=email, is_active=True
+    ).first()
+    if user is None:
+        return
+
+    # 64 URL-safe characters
+    token = secrets.token_urlsafe(48)
+    token_fields: dict[str, Any] = {
+        "token": PasswordResetToken.hash_token(token),
+        "expires_at": timezone.now() + RESET_TOKEN_LIFETIME,
+        "is_used": False,
+    }
+    try:
+        PasswordResetToken.objects.update_or_create(user=user, defaults=token_fields)
+    except PasswordResetToken.MultipleObjectsReturned:
+        PasswordResetToken.objects.filter(user=user).delete()
+        PasswordResetToken.objects.create(user=user, **token_fields)
+
+    reset_url = f"{settings.FRONTEND_URL}/reset-password?token={token}"
+    send_password_reset_email(email, user.username, reset_url)
@@ -1,54 +1,163 @@
 """
 Signal handlers for authentication app.
 """
+from django.db import transaction
+from django.core.cache import cache
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 from .models import UserProfile
+from .serializers import (
+    PROFILE_FILE_FIELDS,
+    PROFILE_SNAPSHOT_VERSION,
+    UserProfileSerializer,
+    user_cache_key,
+)
+from .services import delete_avatar_variants, render_avatar_variants, variant_prefix
 import logging
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# User fields absent from profile payloads; saving only these keeps the
+# stored snapshot and the cached user payload
+PROFILE_CACHE_IGNORED_USER_FIELDS: frozenset[str] = frozenset({'last_login', 'password'})
 
-@receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
+
+def build_profile_snapshot(profile: UserProfile) -> dict:
     """
-    Create a UserProfile when a new User is created.
+    Serialize a profile for storage in ``UserProfile.profile_cache``.
+    
+    Built without a request, so the file URL fields are left out; readers
+    render them per request with ``UserProfileFilesSerializer``. The
+    payload is stored with ``PROFILE_SNAPSHOT_VERSION`` so readers can
+    tell when it predates a serializer change.
     
+    Args:
+        profile: Profile to serialize, with its user loaded
+        
+    Returns:
+        Dict with the snapshot ``version`` and the ``UserProfileSerializer``
+        ``payload``, minus file fields
+    """
+    data = UserProfileSerializer(profile).data
+    return {
+        'version': PROFILE_SNAPSHOT_VERSION,
+        'payload': {field: value for field, value in data.items() if field not in PROFILE_FILE_FIELDS},
+    }
+
+
+@receiver(post_save, sender=User)
+def sync_user_profile(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Create the UserProfile for a new User and keep ``full_name`` in sync.
+
+    Views rely on every User having a profile; migration 0009 backfills
+    users that predate this receiver.
+
+    Profile fields are edited through ``UserProfileView``, so saves of an
+    existing User only touch the profile when a field it embeds may have
+    changed; ``update_fields`` saves such as the ``last_login`` update on
+    login do no extra work. Any other change drops the cached user
+    payload and refreshes ``full_name`` and the stored snapshot in one
+    UPDATE. Callers that create the profile themselves
+    (``RegisterSerializer``) set ``_skip_profile_signal`` on the instance
+    to opt out.
+
     Args:
         sender: The model class (User)
         instance: The actual instance being saved
         created: Boolean indicating if this is a new instance
+        update_fields: Fields passed to ``save(update_fields=...)``, if any
         **kwargs: Additional keyword arguments
     """
-    if created:
-        try:
-            UserProfile.objects.create(user=instance)
-            logger.info(f"Created profile for user: {instance.username}")
-        except Exception as e:
-            logger.error(f"Failed to create profile for user {instance.username}: {e}")
+    full_name: str = UserProfile.build_full_name(instance)
 
+    if not created:
+        if update_fields is not None and not set(update_fields) - PROFILE_CACHE_IGNORED_USER_FIELDS:
+            return
+        transaction.on_commit(lambda: cache.delete(user_cache_key(instance.pk)))
+        profile = UserProfile.objects.filter(user=instance).first()
+        if profile is None:
+            return
+        profile.user = instance
+        profile.full_name = full_name
+        UserProfile.objects.filter(pk=profile.pk).update(
+            full_name=full_name,
+            profile_cache=build_profile_snapshot(profile),
+        )
+        return
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
+    if getattr(instance, '_skip_profile_signal', False):
+        return
+
+    # Errors propagate: views read ``user.profile`` without a fallback
+    _, profile_created = UserProfile.objects.get_or_create(
+        user=instance, defaults={'full_name': full_name}
+    )
+    if profile_created:
+        logger.info(f"Created profile for user: {instance.username}")
+
+
+@receiver(post_save, sender=UserProfile)
+def render_profile_avatars(sender, instance, update_fields=None, **kwargs):
     """
-    Save the UserProfile when the User is saved.
-    
+    Render the stored avatar variants once, when the avatar changes.
+
+    ``avatar_sm``/``avatar_md`` hold storage names that serializers turn
+    into URLs, so no thumbnail work happens per request. Variants are
+    written with a queryset ``update()`` so this receiver does not
+    re-trigger itself; the files they replace are deleted once the
+    transaction commits.
+
     Args:
-        sender: The model class (User)
+        sender: The model class (UserProfile)
         instance: The actual instance being saved
+        update_fields: Fields passed to ``save(update_fields=...)``, if any
         **kwargs: Additional keyword arguments
     """
-    try:
-        instance.profile.save()
-        logger.debug(f"Saved profile for user: {instance.username}")
-    except UserProfile.DoesNotExist:
-        # Profile doesn't exist, create it
+    if update_fields is not None and 'avatar' not in update_fields:
+        return
+
+    if not instance.avatar:
+        variants = {'avatar_sm': '', 'avatar_md': ''}
+    else:
+        if instance.avatar_sm.startswith(variant_prefix(instance.pk, instance.avatar.name, 'sm')):
+            return
         try:
-            UserProfile.objects.create(user=instance)
-            logger.info(f"Created missing profile for user: {instance.username}")
+            variants = render_avatar_variants(instance)
         except Exception as e:
-            logger.error(f"Failed to create missing profile for user {instance.username}: {e}")
-    except Exception as e:
-        logger.error(f"Failed to save profile for user {instance.username}: {e}") 
\ No newline at end of file
+            logger.error(f"Failed to render avatar variants for profile {instance.pk}: {e}")
+            return
+
+    stale = [getattr(instance, field) for field in variants]
+    if stale == list(variants.values()):
+        return
+
+    UserProfile.objects.filter(pk=instance.pk).update(**variants)
+    for field, value in variants.items():
+        setattr(instance, field, value)
+
+    storage = instance.avatar.storage
+    transaction.on_commit(lambda: delete_avatar_variants(instance.pk, stale, storage))
+
+
+@receiver(post_save, sender=UserProfile)
+def store_profile_snapshot(sender, instance, **kwargs):
+    """
+    Store the serialized profile so reads can return it verbatim.
+
+    Registered after ``render_profile_avatars`` so the snapshot carries
+    the new variant URLs. Written with a queryset ``update()`` so the
+    save does not recurse.
+
+    Args:
+        sender: The model class (UserProfile)
+        instance: The actual instance being saved
+        **kwargs: Additional keyword arguments
+    """
+    snapshot = build_profile_snapshot(instance)
+    if snapshot == instance.profile_cache:
+        return
+    UserProfile.objects.filter(pk=instance.pk).update(profile_cache=snapshot)
+    instance.profile_cache = snapshot
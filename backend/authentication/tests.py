@@ -0,0 +1,672 @@
+"""Tests for the authentication app."""
+
+import io
+import re
+import shutil
+import tempfile
+import time
+import hashlib
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.mail.backends import locmem
+from django.db import DatabaseError, IntegrityError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from authentication.checks import check_throttle_cache
+from authentication.models import LoginAttempt, PasswordResetToken, UserProfile
+from authentication.serializers import (
+    PROFILE_SNAPSHOT_VERSION,
+    PasswordResetConfirmSerializer,
+    validate_login,
+)
+from authentication.services.avatars import variant_dir
+from authentication.services.login_attempt_buffer import (
+    USERNAME_MAX_LENGTH,
+    LoginAttemptBuffer,
+    normalize_attempt,
+)
+
+LOGIN_URL = "/api/auth/login/"
+RESET_URL = "/api/auth/password/reset/"
+RESET_CONFIRM_URL = "/api/auth/password/reset/confirm/"
+CHECK_AUTH_URL = "/api/auth/check-auth/"
+REGISTER_URL = "/api/auth/register/"
+PASSWORD_CHANGE_URL = "/api/auth/password/change/"
+
+
+def _png_upload(name: str, color: str, size: int = 128) -> SimpleUploadedFile:
+    buffer = io.BytesIO()
+    Image.new("RGB", (size, size), color).save(buffer, format="PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class AvatarVariantTests(TestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _upload(self, username: str, name: str, color: str) -> UserProfile:
+        user = User.objects.create_user(username=username, password="unused-password")
+        profile = UserProfile.objects.get(user=user)
+        profile.avatar = _png_upload(name, color)
+        profile.save()
+        return UserProfile.objects.get(pk=profile.pk)
+
+    def test_variants_do_not_overwrite_other_uploads(self) -> None:
+        first = self._upload("alice", "me_sm.png", "red")
+        second = self._upload("bob", "me.png", "blue")
+
+        first.refresh_from_db()
+        with Image.open(first.avatar.path) as image:
+            self.assertEqual(image.size, (128, 128))
+            self.assertEqual(image.getpixel((0, 0)), (255, 0, 0))
+        self.assertTrue(second.avatar_sm.startswith(variant_dir(second.pk)))
+        with second.avatar.storage.open(second.avatar_sm) as handle, Image.open(handle) as image:
+            self.assertEqual(image.size, (64, 64))
+
+    def test_replacing_avatar_deletes_only_own_variants(self) -> None:
+        profile = self._upload("carol", "face.png", "green")
+        old_sm = profile.avatar_sm
+        storage = profile.avatar.storage
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.avatar = _png_upload("face2.png", "white")
+            profile.save()
+
+        profile.refresh_from_db()
+        self.assertNotEqual(profile.avatar_sm, old_sm)
+        self.assertFalse(storage.exists(old_sm))
+        self.assertTrue(storage.exists(profile.avatar_sm))
+        self.assertTrue(storage.exists("avatars/face.png"))
+
+
+class ProfileViewTests(TestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username="dave", password="unused-password")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_get_and_patch_return_same_avatar_urls(self) -> None:
+        patched = self.client.patch(
+            "/api/auth/profile/", {"avatar": _png_upload("a.png", "red")}, format="multipart"
+        )
+        self.assertEqual(patched.status_code, 200)
+
+        fetched = self.client.get("/api/auth/profile/")
+        self.assertEqual(fetched.status_code, 200)
+        for field in ("avatar", "avatar_sm", "avatar_md"):
+            self.assertTrue(fetched.data[field].startswith("http://testserver/media/"), field)
+        self.assertEqual(fetched.data["avatar"], patched.data["avatar"])
+
+
+class ProfileTokenAuthenticationTests(TestCase):
+    def test_token_request_loads_user_and_profile_in_one_query(self) -> None:
+        user = User.objects.create_user(username="otto", first_name="Otto")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user).key}")
+
+        with self.assertNumQueries(1):
+            response = client.get("/api/auth/profile/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["full_name"], "Otto")
+
+
+class LoginThrottleTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _login(self, username: str, password: str):
+        return self.client.post(
+            LOGIN_URL, {"username": username, "password": password}, content_type="application/json"
+        )
+
+    def test_failed_logins_are_throttled_with_retry_after(self) -> None:
+        User.objects.create_user(username="erin", password="correct-horse-battery")
+
+        codes = [self._login("erin", "wrong").status_code for _ in range(5)]
+        throttled = self._login("erin", "wrong")
+
+        self.assertEqual(codes, [400] * 5)
+        self.assertEqual(throttled.status_code, 429)
+        self.assertEqual(throttled.json()["error"], "rate_limited")
+        self.assertGreater(int(throttled["Retry-After"]), 0)
+
+    def test_usernames_differing_in_case_have_separate_buckets(self) -> None:
+        User.objects.create_user(username="kate", password="correct-horse-battery")
+        User.objects.create_user(username="Kate", password="correct-horse-battery")
+
+        for _ in range(5):
+            self._login("kate", "wrong")
+
+        self.assertEqual(self._login("kate", "wrong").status_code, 429)
+        self.assertEqual(self._login("Kate", "correct-horse-battery").status_code, 200)
+
+    def test_successful_logins_do_not_count_against_the_username(self) -> None:
+        User.objects.create_user(username="frank", password="correct-horse-battery")
+
+        codes = [self._login("frank", "correct-horse-battery").status_code for _ in range(8)]
+
+        self.assertEqual(codes, [200] * 8)
+
+
+class ValidateLoginTests(TestCase):
+    def test_missing_fields(self) -> None:
+        user, errors = validate_login({})
+        self.assertIsNone(user)
+        self.assertEqual(errors, {
+            "username": ["This field is required."],
+            "password": ["This field is required."],
+        })
+
+    def test_blank_field(self) -> None:
+        _, errors = validate_login({"username": "  ", "password": "secret"})
+        self.assertEqual(errors, {"username": ["This field may not be blank."]})
+
+    def test_oversized_field(self) -> None:
+        _, errors = validate_login({"username": "x" * 151, "password": "secret"})
+        self.assertEqual(errors, {
+            "username": ["Ensure this field has no more than 150 characters."]
+        })
+
+    def test_non_object_body(self) -> None:
+        _, errors = validate_login([1, 2])
+        self.assertEqual(errors, {
+            "non_field_errors": ["Invalid data. Expected a dictionary, but got list."]
+        })
+
+    def test_non_object_body_returns_400(self) -> None:
+        response = self.client.post(LOGIN_URL, [1, 2], content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("non_field_errors", response.json()["errors"])
+
+
+class LoginAttemptBufferTests(TestCase):
+    def test_normalize_attempt_coerces_values_the_columns_reject(self) -> None:
+        fields = normalize_attempt(["x" * 300], "not-an-ip", success=False)
+
+        self.assertEqual(fields["username"], str(["x" * 300])[:USERNAME_MAX_LENGTH])
+        self.assertIsNone(fields["ip_address"])
+        self.assertFalse(fields["success"])
+        self.assertIsNone(normalize_attempt("ann", None)["ip_address"])
+        self.assertEqual(normalize_attempt("ann", "::1")["ip_address"], "::1")
+
+    def test_failed_batch_is_retried_row_by_row(self) -> None:
+        bulk_create = LoginAttempt.objects.bulk_create
+        calls = []
+
+        def flaky_bulk_create(objs, **kwargs):
+            calls.append(len(objs))
+            if len(objs) > 1 or objs[0].username == "bad":
+                raise DatabaseError("rejected")
+            return bulk_create(objs, **kwargs)
+
+        batch = [
+            normalize_attempt(name, "127.0.0.1", success=False)
+            for name in ("ann", "bad", "bob")
+        ]
+        with mock.patch.object(LoginAttempt.objects, "bulk_create", flaky_bulk_create):
+            with self.assertLogs(
+                "authentication.services.login_attempt_buffer", level="ERROR"
+            ) as logs:
+                written = LoginAttemptBuffer()._write(batch)
+
+        self.assertEqual(written, 2)
+        self.assertEqual(calls, [3, 1, 1, 1])
+        self.assertEqual(
+            sorted(LoginAttempt.objects.values_list("username", flat=True)), ["ann", "bob"]
+        )
+        self.assertIn("'bad'", logs.output[0])
+
+    def test_flush_writes_queued_attempts_in_batches(self) -> None:
+        buffer = LoginAttemptBuffer(max_batch=2)
+        for name in ("ann", "bob", "cat"):
+            buffer._queue.put_nowait(normalize_attempt(name, "127.0.0.1", success=True))
+
+        with mock.patch.object(
+            LoginAttempt.objects, "bulk_create", wraps=LoginAttempt.objects.bulk_create
+        ) as bulk_create:
+            written = buffer.flush()
+
+        self.assertEqual(written, 3)
+        self.assertEqual(bulk_create.call_count, 2)
+        self.assertEqual(LoginAttempt.objects.filter(success=True).count(), 3)
+
+
+@override_settings(PASSWORD_RESET_RESPONSE_TIME=0)
+class PasswordResetTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(
+            username="grace", email="grace@example.com", password="old-password-123"
+        )
+
+    def _request_reset(self, email: str):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(RESET_URL, {"email": email}, content_type="application/json")
+
+    def _confirm(self, token: str, password: str):
+        return self.client.post(RESET_CONFIRM_URL, {
+            "token": token, "new_password": password, "new_password_confirm": password,
+        }, content_type="application/json")
+
+    def test_known_and_unknown_emails_get_identical_responses(self) -> None:
+        known = self._request_reset("grace@example.com")
+        unknown = self._request_reset("nobody@example.com")
+
+        self.assertEqual(known.status_code, unknown.status_code)
+        self.assertEqual(known.json(), unknown.json())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["grace@example.com"])
+
+    def test_token_is_stored_as_digest_and_works_once(self) -> None:
+        self._request_reset("grace@example.com")
+        token = re.search(r"token=(\S+)", mail.outbox[0].body).group(1)
+
+        stored = PasswordResetToken.objects.get(user=self.user)
+        self.assertEqual(bytes(stored.token), PasswordResetToken.hash_token(token))
+        self.assertNotIn(token.encode(), bytes(stored.token))
+
+        first = self._confirm(token, "new-password-456")
+        second = self._confirm(token, "other-password-789")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 400)
+        self.assertIn("token", second.json()["errors"])
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("new-password-456"))
+
+    def test_token_claimed_after_validation_is_rejected(self) -> None:
+        self._request_reset("grace@example.com")
+        token = re.search(r"token=(\S+)", mail.outbox[0].body).group(1)
+        validate_token = PasswordResetConfirmSerializer.validate_token
+
+        def validate_then_lose_race(serializer, value):
+            # A concurrent confirm claims the token between lookup and claim
+            token_obj = validate_token(serializer, value)
+            PasswordResetToken.objects.filter(pk=token_obj.pk).update(is_used=True)
+            return token_obj
+
+        with mock.patch.object(
+            PasswordResetConfirmSerializer, "validate_token", validate_then_lose_race
+        ):
+            response = self._confirm(token, "new-password-456")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("token", response.json()["errors"])
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("old-password-123"))
+
+
+class PasswordChangeTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="hank", password="old-password-123")
+
+    def _change(self, client: APIClient):
+        return client.post(PASSWORD_CHANGE_URL, {
+            "old_password": "old-password-123",
+            "new_password": "new-password-456",
+            "new_password_confirm": "new-password-456",
+        }, format="json")
+
+    def _profile_status(self, key: str) -> int:
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {key}")
+        return client.get("/api/auth/profile/").status_code
+
+    def test_change_rotates_existing_token(self) -> None:
+        old_key = Token.objects.create(user=self.user).key
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {old_key}")
+
+        response = self._change(client)
+
+        self.assertEqual(response.status_code, 200)
+        new_key = response.json()["token"]
+        self.assertNotEqual(new_key, old_key)
+        self.assertEqual(Token.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(self._profile_status(old_key), 403)
+        self.assertEqual(self._profile_status(new_key), 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("new-password-456"))
+
+    def test_change_creates_token_when_user_had_none(self) -> None:
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = self._change(client)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Token.objects.get(user=self.user).key, response.json()["token"])
+
+
+class PurgeExpiredTokensTests(TestCase):
+    def _token(self, username: str, expires_in: timedelta) -> PasswordResetToken:
+        return PasswordResetToken.objects.create(
+            user=User.objects.create_user(username=username),
+            token=PasswordResetToken.hash_token(username),
+            expires_at=timezone.now() + expires_in,
+        )
+
+    def test_deletes_only_tokens_expired_before_cutoff(self) -> None:
+        self._token("old", -timedelta(days=8))
+        recent = self._token("recent", -timedelta(days=6))
+        live = self._token("live", timedelta(hours=1))
+        out = io.StringIO()
+
+        call_command("purge_expired_tokens", "--days", "7", stdout=out)
+
+        self.assertQuerySetEqual(
+            PasswordResetToken.objects.order_by("pk"), [recent, live]
+        )
+        self.assertIn("Deleted 1 password reset token(s)", out.getvalue())
+
+
+@override_settings(PASSWORD_RESET_RESPONSE_TIME=0.3, AUTH_BACKGROUND_WORKERS=False)
+class PasswordResetTimingTests(TransactionTestCase):
+    """Runs in autocommit, so the reset job runs inline as in production."""
+
+    SMTP_DELAY = 0.1
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+        User.objects.create_user(username="heidi", email="heidi@example.com")
+        send_messages = locmem.EmailBackend.send_messages
+
+        def slow_send_messages(backend, messages):
+            time.sleep(self.SMTP_DELAY)
+            return send_messages(backend, messages)
+
+        patcher = mock.patch.object(locmem.EmailBackend, "send_messages", slow_send_messages)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Load the URLconf and view before timing anything
+        self.client.post(RESET_URL, {}, content_type="application/json")
+
+    def _timed_reset(self, email: str) -> float:
+        started = time.monotonic()
+        response = self.client.post(RESET_URL, {"email": email}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        return time.monotonic() - started
+
+    def test_known_and_unknown_emails_take_the_same_time(self) -> None:
+        known = self._timed_reset("heidi@example.com")
+        self.assertEqual(len(mail.outbox), 1)
+        unknown = self._timed_reset("nobody@example.com")
+
+        self.assertGreaterEqual(known, 0.3)
+        self.assertGreaterEqual(unknown, 0.3)
+        self.assertLess(abs(known - unknown), self.SMTP_DELAY / 2)
+
+
+class CheckAuthTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="heidi"))
+
+    def test_matching_etag_returns_304(self) -> None:
+        first = self.client.get(CHECK_AUTH_URL)
+        repeat = self.client.get(CHECK_AUTH_URL, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat["ETag"], first["ETag"])
+        self.assertEqual(repeat.content, b"")
+
+    def test_stale_etag_returns_payload(self) -> None:
+        response = self.client.get(CHECK_AUTH_URL, HTTP_IF_NONE_MATCH='"stale"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["authenticated"])
+
+
+class ProfileSyncTests(TestCase):
+    def test_user_edit_refreshes_full_name(self) -> None:
+        user = User.objects.create_user(username="ivan")
+        self.assertEqual(UserProfile.objects.get(user=user).full_name, "ivan")
+
+        user.first_name = "Ivan"
+        user.last_name = "Petrov"
+        user.save()
+
+        self.assertEqual(UserProfile.objects.get(user=user).full_name, "Ivan Petrov")
+
+    def test_user_edit_refreshes_snapshot(self) -> None:
+        user = User.objects.create_user(username="ivy")
+
+        user.first_name = "Ivy"
+        user.last_name = "Lopez"
+        user.save()
+
+        snapshot = UserProfile.objects.get(user=user).profile_cache
+        self.assertEqual(snapshot["version"], PROFILE_SNAPSHOT_VERSION)
+        self.assertEqual(snapshot["payload"]["full_name"], "Ivy Lopez")
+        self.assertEqual(snapshot["payload"]["user"]["first_name"], "Ivy")
+
+    def test_last_login_update_leaves_snapshot_alone(self) -> None:
+        user = User.objects.create_user(username="judy")
+        snapshot = UserProfile.objects.get(user=user).profile_cache
+        self.assertEqual(snapshot["payload"]["full_name"], "judy")
+
+        user.first_name = "Unsaved"
+        user.save(update_fields=["last_login"])
+
+        self.assertEqual(UserProfile.objects.get(user=user).profile_cache, snapshot)
+
+    def test_stale_snapshot_version_falls_back_to_serializer(self) -> None:
+        user = User.objects.create_user(username="kate", first_name="Kate")
+        UserProfile.objects.filter(user=user).update(
+            profile_cache={"version": "0:stale", "payload": {"full_name": "Old Shape"}}
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.get("/api/auth/profile/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["full_name"], "Kate")
+        self.assertEqual(response.data["user"]["first_name"], "Kate")
+
+
+class ThrottleCacheCheckTests(TestCase):
+    LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+    def test_warns_for_local_cache_outside_debug(self) -> None:
+        with override_settings(DEBUG=False, CACHES=self.LOCMEM):
+            self.assertEqual([w.id for w in check_throttle_cache()], ["authentication.W001"])
+
+    def test_silent_in_debug(self) -> None:
+        with override_settings(DEBUG=True, CACHES=self.LOCMEM):
+            self.assertEqual(check_throttle_cache(), [])
+
+
+class RegisterTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _register(self, username: str, email: str = ""):
+        return self.client.post(REGISTER_URL, {
+            "username": username, "email": email, "first_name": "Nora",
+            "password": "sound-password-123", "password_confirm": "sound-password-123",
+        }, content_type="application/json")
+
+    def test_register_creates_user_profile_and_token(self) -> None:
+        response = self._register("nora", "nora@example.com")
+
+        self.assertEqual(response.status_code, 201)
+        user = User.objects.get(username="nora")
+        self.assertEqual(user.profile.full_name, "Nora")
+        self.assertEqual(Token.objects.get(user=user).key, response.json()["token"])
+        self.assertEqual(response.json()["profile"]["full_name"], "Nora")
+
+    def test_integrity_error_is_reported_and_rolled_back(self) -> None:
+        with mock.patch.object(
+            UserProfile.objects, "create", side_effect=IntegrityError("duplicate")
+        ):
+            response = self._register("nora")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("username", response.json())
+        self.assertFalse(User.objects.filter(username="nora").exists())
+
+    def test_duplicate_username_and_email_are_rejected(self) -> None:
+        self._register("nora", "nora@example.com")
+
+        same_username = self._register("nora", "other@example.com")
+        same_email = self._register("olga", "nora@example.com")
+
+        self.assertEqual(same_username.status_code, 400)
+        self.assertIn("username", same_username.json()["errors"])
+        self.assertEqual(same_email.status_code, 400)
+        self.assertEqual(same_email.json()["errors"]["email"], ["Email already exists."])
+        self.assertEqual(User.objects.count(), 1)
+
+
+class PasswordPolicyTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(
+            username="leo", email="leo@example.com", password="old-password-123"
+        )
+
+    def _register(self, password: str):
+        return self.client.post(REGISTER_URL, {
+            "username": "mia", "password": password, "password_confirm": password,
+        }, content_type="application/json")
+
+    def _change(self, password: str):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client.post(PASSWORD_CHANGE_URL, {
+            "old_password": "old-password-123",
+            "new_password": password,
+            "new_password_confirm": password,
+        }, format="json")
+
+    def test_register_rejects_weak_password(self) -> None:
+        response = self._register("x")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("password", response.json()["errors"])
+
+    def test_password_change_rejects_weak_password(self) -> None:
+        response = self._change("x")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("new_password", response.json()["errors"])
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("old-password-123"))
+
+    def test_reset_confirm_rejects_weak_password(self) -> None:
+        token = "weak-reset-token"
+        PasswordResetToken.objects.create(
+            user=self.user,
+            token=PasswordResetToken.hash_token(token),
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+
+        response = self.client.post(RESET_CONFIRM_URL, {
+            "token": token, "new_password": "x", "new_password_confirm": "x",
+        }, content_type="application/json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("new_password", response.json()["errors"])
+
+    @override_settings(AUTH_PASSWORD_VALIDATORS=[])
+    def test_validators_follow_settings(self) -> None:
+        self.assertEqual(self._register("x").status_code, 201)
+        self.assertEqual(self._change("x").status_code, 200)
+
+
+class MigrationTestCase(TransactionTestCase):
+    """Migrates the app back to ``migrate_from`` to test one data migration."""
+
+    migrate_from: str
+    migrate_to: str
+
+    def setUp(self) -> None:
+        self.addCleanup(self._migrate, None)
+        self.old_apps = self._migrate(self.migrate_from)
+
+    def _migrate(self, name):
+        executor = MigrationExecutor(connection)
+        targets = (
+            [("authentication", name)] if name else executor.loader.graph.leaf_nodes()
+        )
+        executor.migrate(targets)
+        executor.loader.build_graph()
+        return executor.loader.project_state(targets).apps
+
+    def migrate(self):
+        return self._migrate(self.migrate_to)
+
+
+class HashPasswordResetTokensMigrationTests(MigrationTestCase):
+    migrate_from = "0006_userprofile_avatar_variants"
+    migrate_to = "0007_hash_password_reset_tokens"
+
+    def test_existing_tokens_are_replaced_by_their_digest(self) -> None:
+        User = self.old_apps.get_model("auth", "User")
+        PasswordResetToken = self.old_apps.get_model("authentication", "PasswordResetToken")
+        PasswordResetToken.objects.create(
+            user=User.objects.create(username="pia"),
+            token="raw-reset-token",
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+
+        apps = self.migrate()
+
+        stored = apps.get_model("authentication", "PasswordResetToken").objects.get()
+        self.assertEqual(bytes(stored.token), hashlib.sha256(b"raw-reset-token").digest())
+
+
+class CreateMissingProfilesMigrationTests(MigrationTestCase):
+    migrate_from = "0008_userprofile_profile_cache"
+    migrate_to = "0009_create_missing_profiles"
+
+    def test_users_without_a_profile_get_one(self) -> None:
+        User = self.old_apps.get_model("auth", "User")
+        UserProfile = self.old_apps.get_model("authentication", "UserProfile")
+        # Historical models send no signals, so neither user gets a profile
+        User.objects.create(username="quinn", first_name="Quinn", last_name="Hale")
+        User.objects.create(username="ravi")
+        UserProfile.objects.create(
+            user=User.objects.create(username="sam"), full_name="Kept Name"
+        )
+
+        apps = self.migrate()
+
+        full_names = dict(
+            apps.get_model("authentication", "UserProfile").objects.values_list(
+                "user__username", "full_name"
+            )
+        )
+        self.assertEqual(
+            full_names, {"quinn": "Quinn Hale", "ravi": "ravi", "sam": "Kept Name"}
+        )
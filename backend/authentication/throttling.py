@@ -0,0 +1,229 @@
+"""
+Request throttles for the unauthenticated authentication endpoints.
+"""
+import hashlib
+import math
+import re
+from collections.abc import Mapping
+from typing import Optional, Tuple
+
+from rest_framework import exceptions, status
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+# Period of a rate string: optional multiplier, then a unit (``15m``, ``h``)
+_RATE_PERIOD = re.compile(r'(\d*)([smhd])[a-z]*')
+
+_PERIOD_SECONDS: dict[str, int] = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def get_client_ip(request) -> Optional[str]:
+    """
+    Get the client address that the deployment's proxies vouch for.
+
+    ``X-Forwarded-For`` is client-controlled except for the hops appended
+    by our own proxies, so only the entry ``NUM_PROXIES`` from the right
+    is trusted. With no proxies configured the header is ignored, so a
+    client cannot pick its own identity by sending one.
+
+    Args:
+        request: HTTP request object
+        
+    Returns:
+        Client IP address as string
+    """
+    remote_addr: Optional[str] = request.META.get('REMOTE_ADDR')
+    num_proxies: int = api_settings.NUM_PROXIES or 0
+    x_forwarded_for: Optional[str] = request.META.get('HTTP_X_FORWARDED_FOR')
+    if num_proxies <= 0 or not x_forwarded_for:
+        return remote_addr
+    hops: list[str] = x_forwarded_for.split(',')
+    return hops[-min(num_proxies, len(hops))].strip()
+
+
+class WindowRateThrottle(SimpleRateThrottle):
+    """
+    ``SimpleRateThrottle`` that accepts multi-unit windows such as ``5/15m``.
+
+    DRF's own parser only reads the first character of the period, so
+    ``15m`` would fail to parse.
+    """
+
+    def parse_rate(self, rate: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Parse a rate string into a request count and window length.
+
+        Args:
+            rate: Rate such as ``20/15m`` or ``100/day``
+
+        Returns:
+            Tuple of allowed requests and window length in seconds
+        """
+        if rate is None:
+            return (None, None)
+        num, period = rate.split('/')
+        match = _RATE_PERIOD.fullmatch(period.strip())
+        if match is None:
+            raise ValueError(f"Invalid throttle rate: {rate!r}")
+        multiplier: int = int(match.group(1) or 1)
+        return (int(num), multiplier * _PERIOD_SECONDS[match.group(2)])
+
+
+class ClientIPThrottle(WindowRateThrottle):
+    """
+    Throttle keyed on the client IP address.
+
+    Subclasses set ``scope``; the rate comes from ``DEFAULT_THROTTLE_RATES``.
+    """
+
+    def get_cache_key(self, request, view) -> str:
+        """
+        Build the cache key for the requesting client.
+
+        Args:
+            request: HTTP request object
+            view: View being throttled
+
+        Returns:
+            Cache key for this scope and IP
+        """
+        return self.cache_format % {'scope': self.scope, 'ident': get_client_ip(request)}
+
+
+class RequestFieldThrottle(WindowRateThrottle):
+    """
+    Throttle keyed on one field of the request body.
+
+    Limits attempts against a single account however many IPs they come
+    from. The value is hashed into the key, so keys have a fixed length
+    whatever the client sends. Requests without a usable value, including
+    bodies that are not JSON objects, are left to the other throttles and
+    the view's own validation.
+
+    Values are compared as submitted after trimming whitespace; subclasses
+    set ``fold_case`` for fields that are case-insensitive. Usernames are
+    not: ``alice`` and ``Alice`` are different accounts.
+    """
+
+    field: str = ''
+    fold_case: bool = False
+
+    def get_cache_key(self, request, view) -> Optional[str]:
+        """
+        Build the cache key for the submitted field value.
+
+        Args:
+            request: HTTP request object
+            view: View being throttled
+
+        Returns:
+            Cache key for this scope and value, or None to skip throttling
+        """
+        if not isinstance(request.data, Mapping):
+            return None
+        value = request.data.get(self.field)
+        if not isinstance(value, str) or not value.strip():
+            return None
+        value = value.strip().lower() if self.fold_case else value.strip()
+        ident: str = hashlib.sha256(value.encode('utf-8')).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class LoginIPThrottle(ClientIPThrottle):
+    """Limit login attempts per client IP."""
+
+    scope: str = 'login_ip'
+
+
+class LoginUsernameThrottle(RequestFieldThrottle):
+    """
+    Limit failed login attempts per username.
+
+    Only failures count: ``LoginView`` charges them via ``record_failure``,
+    so the owner's own successful logins never use up the limit. The
+    bucket is shared by every IP, which caps password guessing spread
+    over many addresses; the trade-off is that anyone can still block an
+    account for the window by sending enough wrong passwords for it.
+    """
+
+    scope: str = 'login_username'
+    field: str = 'username'
+
+    def throttle_success(self) -> bool:
+        """
+        Allow the request without recording it.
+
+        Returns:
+            True
+        """
+        return True
+
+    def record_failure(self, request, view) -> None:
+        """
+        Count a failed login against the submitted username.
+
+        Args:
+            request: HTTP request object
+            view: View that rejected the login
+        """
+        key: Optional[str] = self.get_cache_key(request, view)
+        if key is None:
+            return
+        now: float = self.timer()
+        history: list[float] = [
+            timestamp for timestamp in self.cache.get(key, [])
+            if timestamp > now - self.duration
+        ]
+        history.insert(0, now)
+        self.cache.set(key, history, self.duration)
+
+
+class RegisterIPThrottle(ClientIPThrottle):
+    """Limit registrations per client IP."""
+
+    scope: str = 'register_ip'
+
+
+class PasswordResetIPThrottle(ClientIPThrottle):
+    """Limit password reset requests per client IP."""
+
+    scope: str = 'password_reset_ip'
+
+
+class PasswordResetEmailThrottle(RequestFieldThrottle):
+    """Limit password reset emails per address."""
+
+    scope: str = 'password_reset_email'
+    field: str = 'email'
+    fold_case: bool = True
+
+
+class RateLimitedResponseMixin:
+    """
+    Return throttled requests in the app's JSON error shape.
+
+    Throttles run in ``APIView.initial()``, before the handler, so a
+    rejected request never reaches the serializer or password hasher.
+    """
+
+    def handle_exception(self, exc: Exception) -> Response:
+        """
+        Convert ``Throttled`` into a 429 response with ``Retry-After``.
+
+        Args:
+            exc: Exception raised while handling the request
+
+        Returns:
+            Response for the client
+        """
+        if not isinstance(exc, exceptions.Throttled):
+            return super().handle_exception(exc)
+        response = Response({
+            'success': False,
+            'message': 'Too many requests. Please try again later.',
+            'error': 'rate_limited',
+        }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        if exc.wait is not None:
+            response['Retry-After'] = str(math.ceil(exc.wait))
+        return response
@@ -1,26 +1,49 @@
 """
 URL configuration for authentication app.
 """
-from django.urls import path
+from django.urls import include, path
 from . import views
 
 app_name: str = 'authentication'
 
-urlpatterns: list = [
-    # Authentication endpoints
-    path('login/', views.LoginView.as_view(), name='login'),
-    path('logout/', views.LogoutView.as_view(), name='logout'),
-    path('register/', views.RegisterView.as_view(), name='register'),
-    
-    # User profile management
-    path('profile/', views.UserProfileView.as_view(), name='profile'),
-    path('user-info/', views.user_info, name='user_info'),
-    
-    # Password management
-    path('password/change/', views.PasswordChangeView.as_view(), name='password_change'),
-    path('password/reset/', views.PasswordResetRequestView.as_view(), name='password_reset_request'),
-    path('password/reset/confirm/', views.PasswordResetConfirmView.as_view(), name='password_reset_confirm'),
-    
-    # Authentication status
-    path('check-auth/', views.check_auth, name='check_auth'),
-] 
\ No newline at end of file
+
+def build_auth_patterns(name_prefix: str = '') -> list:
+    """
+    Build the authentication URL tree.
+
+    Routes are grouped under nested ``include()`` prefixes so the resolver
+    rejects a whole subtree (e.g. ``password/``) with one prefix check
+    instead of scanning every leaf pattern.
+
+    Args:
+        name_prefix: Prefix applied to every route name (``api_`` for the
+            ``auth_api`` namespace)
+
+    Returns:
+        List of URL patterns
+    """
+    return [
+        # Authentication endpoints
+        path('login/', views.LoginView.as_view(), name=f'{name_prefix}login'),
+        path('logout/', views.LogoutView.as_view(), name=f'{name_prefix}logout'),
+        path('register/', views.RegisterView.as_view(), name=f'{name_prefix}register'),
+
+        # User profile management
+        path('profile/', views.UserProfileView.as_view(), name=f'{name_prefix}profile'),
+        path('user-info/', views.user_info, name=f'{name_prefix}user_info'),
+
+        # Password management
+        path('password/', include([
+            path('change/', views.PasswordChangeView.as_view(), name=f'{name_prefix}password_change'),
+            path('reset/', include([
+                path('', views.PasswordResetRequestView.as_view(), name=f'{name_prefix}password_reset_request'),
+                path('confirm/', views.PasswordResetConfirmView.as_view(), name=f'{name_prefix}password_reset_confirm'),
+            ])),
+        ])),
+
+        # Authentication status
+        path('check-auth/', views.check_auth, name=f'{name_prefix}check_auth'),
+    ]
+
+
+urlpatterns: list = build_auth_patterns()
@@ -8,26 +8,128 @@ from rest_framework.views import APIView
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import login, logout
 from django.contrib.auth.models import User
-from django.utils import timezone
-from django.core.mail import send_mail
-from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
-from django.utils.crypto import get_random_string
-from typing import Dict, Any
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from collections.abc import Mapping
+from typing import Dict, Any, Optional
+import hashlib
+import json
 import logging
+import time
 
 from .serializers import (
-    UserSerializer, UserProfileSerializer, LoginSerializer,
+    UserProfileSerializer, UserProfileFilesSerializer, serialize_user, validate_login,
     RegisterSerializer, PasswordChangeSerializer,
-    PasswordResetRequestSerializer, PasswordResetConfirmSerializer
+    PasswordResetRequestSerializer, PasswordResetConfirmSerializer,
+    PASSWORD_RESET_TOKEN_INVALID, PROFILE_SNAPSHOT_VERSION
+)
+from .models import UserProfile, PasswordResetToken
+from .services import login_attempt_buffer, pad_password_reset_response, request_password_reset
+from .throttling import (
+    LoginIPThrottle, LoginUsernameThrottle, PasswordResetEmailThrottle,
+    PasswordResetIPThrottle, RateLimitedResponseMixin, RegisterIPThrottle,
+    get_client_ip
 )
-from .models import UserProfile, LoginAttempt, PasswordResetToken
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
-class LoginView(APIView):
+# Longest user agent stored on a LoginAttempt; real browsers stay well below
+USER_AGENT_MAX_LENGTH: int = 255
+
+# Shared bodies of the 400 responses; each view merges in its ``errors``
+LOGIN_FAILED: Dict[str, Any] = {'success': False, 'message': 'Login failed'}
+REGISTRATION_FAILED: Dict[str, Any] = {'success': False, 'message': 'Registration failed'}
+PASSWORD_CHANGE_FAILED: Dict[str, Any] = {'success': False, 'message': 'Password change failed'}
+PASSWORD_RESET_REQUEST_FAILED: Dict[str, Any] = {
+    'success': False, 'message': 'Password reset request failed'
+}
+PASSWORD_RESET_FAILED: Dict[str, Any] = {'success': False, 'message': 'Password reset failed'}
+
+# Returned for every well-formed reset request, whether or not the email
+# belongs to an account
+PASSWORD_RESET_REQUESTED: Dict[str, Any] = {
+    'success': True,
+    'message': 'If an account exists for this email, a password reset link has been sent.'
+}
+
+
+def get_request_profile(request) -> UserProfile:
+    """
+    Get the authenticated user's profile.
+    
+    Token and session authentication join the profile onto the user, and
+    the related-object cache keeps it there for the rest of the request,
+    so this normally issues no query.
+    
+    Args:
+        request: HTTP request object
+        
+    Returns:
+        UserProfile instance for the current user
+        
+    Raises:
+        UserProfile.DoesNotExist: If the user has no profile
+    """
+    return request.user.profile
+
+
+def get_profile_payload(profile: UserProfile, request=None) -> Dict[str, Any]:
+    """
+    Get the serialized profile, preferring its stored snapshot.
+    
+    The snapshot leaves out file URLs, which are rendered here so they
+    are absolute whenever a request is given, as with the serializer.
+    A missing snapshot, or one stored under another
+    ``PROFILE_SNAPSHOT_VERSION``, falls back to the serializer until the
+    profile is next saved. The payload nests the serialized user, so callers reuse
+    ``payload['user']`` rather than running ``UserSerializer`` again.
+    
+    Args:
+        profile: Profile with its user loaded
+        request: HTTP request used to build absolute file URLs, if any
+        
+    Returns:
+        The ``UserProfileSerializer`` payload
+    """
+    context: Dict[str, Any] = {'request': request}
+    snapshot: Dict[str, Any] = profile.profile_cache or {}
+    if snapshot.get('version') != PROFILE_SNAPSHOT_VERSION:
+        return UserProfileSerializer(profile, context=context).data
+    return {
+        **snapshot['payload'],
+        **UserProfileFilesSerializer(profile, context=context).data,
+    }
+
+
+def ensure_token(user: User) -> str:
+    """
+    Get the user's API token key, creating the token if needed.
+    
+    The common case is a single-column SELECT, without the savepoint
+    and model instantiation of ``get_or_create``.
+    
+    Args:
+        user: User needing an API token
+        
+    Returns:
+        The token key
+    """
+    key: Optional[str] = Token.objects.filter(user=user).values_list('key', flat=True).first()
+    if key is not None:
+        return key
+    try:
+        with transaction.atomic():
+            return Token.objects.create(user=user).key
+    except IntegrityError:
+        # A concurrent request created it first
+        return Token.objects.filter(user=user).values_list('key', flat=True).get()
+
+
+class LoginView(RateLimitedResponseMixin, APIView):
     """
     API view for user login.
     
@@ -35,6 +137,7 @@ class LoginView(APIView):
     """
     
     permission_classes: list = [permissions.AllowAny]
+    throttle_classes: list = [LoginIPThrottle, LoginUsernameThrottle]
     
     def post(self, request) -> Response:
         """
@@ -46,66 +149,60 @@ class LoginView(APIView):
         Returns:
             Response with user data and authentication status
         """
-        serializer: LoginSerializer = LoginSerializer(
-            data=request.data,
-            context={'request': request}
-        )
+        user, errors = validate_login(request.data)
         
-        if serializer.is_valid():
-            user: User = serializer.validated_data['user']
-            
+        if user is not None:
             # Log the user in
             login(request, user)
             
             # Create or get token for API access
-            token, created = Token.objects.get_or_create(user=user)
+            token_key: str = ensure_token(user)
             
             # Log login attempt
             self._log_login_attempt(request, user.username, True)
             
-            # Get user profile
-            try:
-                profile: UserProfile = user.profile
-                profile_serializer: UserProfileSerializer = UserProfileSerializer(profile)
-                profile_data: Dict[str, Any] = profile_serializer.data
-            except UserProfile.DoesNotExist:
-                # Create profile if it doesn't exist
-                profile: UserProfile = UserProfile.objects.create(user=user)
-                profile_serializer: UserProfileSerializer = UserProfileSerializer(profile)
-                profile_data: Dict[str, Any] = profile_serializer.data
+            # Joined by ProfileModelBackend; created with the user by signal
+            profile_data: Dict[str, Any] = get_profile_payload(user.profile)
             
             return Response({
                 'success': True,
                 'message': 'Login successful',
-                'user': UserSerializer(user).data,
+                'user': profile_data['user'],
                 'profile': profile_data,
-                'token': token.key,
+                'token': token_key,
             }, status=status.HTTP_200_OK)
         else:
-            # Log failed login attempt
-            username: str = request.data.get('username', 'unknown')
+            # Log failed login attempt; the body may not even be an object
+            username: Any = 'unknown'
+            if isinstance(request.data, Mapping):
+                username = request.data.get('username', 'unknown')
             self._log_login_attempt(request, username, False)
+            LoginUsernameThrottle().record_failure(request, self)
             
-            return Response({
-                'success': False,
-                'message': 'Login failed',
-                'errors': serializer.errors
-            }, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                {**LOGIN_FAILED, 'errors': errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
     
     def _log_login_attempt(self, request, username: str, success: bool) -> None:
         """
         Log login attempt for security monitoring.
         
+        Attempts go through ``login_attempt_buffer``, which batches them
+        off the request thread when ``AUTH_BACKGROUND_WORKERS`` is on.
+        Nothing on the login path reads these rows back (limits come from
+        the throttles), so failures are buffered too.
+        
         Args:
             request: HTTP request object
             username: Username used in login attempt
             success: Whether login was successful
         """
         try:
-            LoginAttempt.objects.create(
+            login_attempt_buffer.put(
                 username=username,
-                ip_address=self._get_client_ip(request),
-                user_agent=request.META.get('HTTP_USER_AGENT', ''),
+                ip_address=get_client_ip(request),
+                user_agent=request.META.get('HTTP_USER_AGENT', '')[:USER_AGENT_MAX_LENGTH],
                 success=success
             )
         except Exception as e:
@@ -146,7 +243,7 @@ class LogoutView(APIView):
         }, status=status.HTTP_200_OK)
 
 
-class RegisterView(APIView):
+class RegisterView(RateLimitedResponseMixin, APIView):
     """
     API view for user registration.
     
@@ -154,6 +251,7 @@ class RegisterView(APIView):
     """
     
     permission_classes: list = [permissions.AllowAny]
+    throttle_classes: list = [RegisterIPThrottle]
     
     def post(self, request) -> Response:
         """
@@ -177,27 +275,25 @@ class RegisterView(APIView):
             # Log the user in after registration
             login(request, user)
             
-            # Create token for API access
-            token, created = Token.objects.get_or_create(user=user)
+            # New users have no token yet
+            token_key: str = Token.objects.create(user=user).key
             
             # Get user profile
-            profile: UserProfile = user.profile
-            profile_serializer: UserProfileSerializer = UserProfileSerializer(profile)
+            profile_data: Dict[str, Any] = get_profile_payload(user.profile)
             
             return Response({
                 'success': True,
                 'message': 'Registration successful',
-                'user': UserSerializer(user).data,
-                'profile': profile_serializer.data,
-                'token': token.key,
+                'user': profile_data['user'],
+                'profile': profile_data,
+                'token': token_key,
             }, status=status.HTTP_201_CREATED)
         else:
             print(f"Registration validation errors: {serializer.errors}")  # Debug line
-            return Response({
-                'success': False,
-                'message': 'Registration failed',
-                'errors': serializer.errors
-            }, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                {**REGISTRATION_FAILED, 'errors': serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
 
 class UserProfileView(generics.RetrieveUpdateAPIView):
@@ -217,7 +313,23 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         Returns:
             UserProfile instance for the current user
         """
-        return self.request.user.profile
+        return get_request_profile(self.request)
+
+    def retrieve(self, request, *args, **kwargs) -> Response:
+        """
+        Return the stored profile snapshot without re-serializing it.
+        
+        Only the file URLs are rendered per request, so they match the
+        absolute URLs an update returns. Profiles saved before the
+        snapshot existed fall back to the serializer.
+        
+        Args:
+            request: HTTP request object
+            
+        Returns:
+            Response with the serialized profile
+        """
+        return Response(get_profile_payload(self.get_object(), request))
 
 
 class PasswordChangeView(APIView):
@@ -246,30 +358,30 @@ class PasswordChangeView(APIView):
         
         if serializer.is_valid():
             user: User = request.user
-            new_password: str = serializer.validated_data['new_password']
             
-            # Change the password
-            user.set_password(new_password)
-            user.save()
+            # Hash before opening the transaction so it stays short
+            user.set_password(serializer.validated_data['new_password'])
+            token_key: str = Token.generate_key()
             
-            # Update or create new token
-            Token.objects.filter(user=user).delete()
-            token, created = Token.objects.get_or_create(user=user)
+            with transaction.atomic():
+                user.save(update_fields=['password'])
+                # Rotate the API token in place; create one if the user had none
+                if not Token.objects.filter(user=user).update(key=token_key):
+                    token_key = Token.objects.create(user=user).key
             
             return Response({
                 'success': True,
                 'message': 'Password changed successfully',
-                'token': token.key,
+                'token': token_key,
             }, status=status.HTTP_200_OK)
         else:
-            return Response({
-                'success': False,
-                'message': 'Password change failed',
-                'errors': serializer.errors
-            }, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                {**PASSWORD_CHANGE_FAILED, 'errors': serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
 
-class PasswordResetRequestView(APIView):
+class PasswordResetRequestView(RateLimitedResponseMixin, APIView):
     """
     API view for password reset request.
     
@@ -277,6 +389,12 @@ class PasswordResetRequestView(APIView):
     """
     
     permission_classes: list = [permissions.AllowAny]
+    throttle_classes: list = [PasswordResetIPThrottle, PasswordResetEmailThrottle]
+    
+    def initial(self, request, *args, **kwargs) -> None:
+        """Note when the request reached the view, before auth and throttling."""
+        self.started_at: float = time.monotonic()
+        super().initial(request, *args, **kwargs)
     
     def post(self, request) -> Response:
         """
@@ -293,59 +411,19 @@ class PasswordResetRequestView(APIView):
         )
         
         if serializer.is_valid():
-            email: str = serializer.validated_data['email']
-            user: User = User.objects.get(email=email)
-            
-            # Generate reset token
-            token: str = get_random_string(64)
-            expires_at: timezone.datetime = timezone.now() + timezone.timedelta(hours=24)
-            
-            # Create or update reset token
-            PasswordResetToken.objects.filter(user=user).delete()
-            PasswordResetToken.objects.create(
-                user=user,
-                token=token,
-                expires_at=expires_at
-            )
-            
-            # Send reset email (in production, implement proper email sending)
-            reset_url: str = f"{settings.FRONTEND_URL}/reset-password?token={token}"
-            
-            try:
-                send_mail(
-                    subject='Password Reset Request - Kwantum Institute',
-                    message=f'''
-                    Hello {user.username},
-                    
-                    You have requested a password reset for your Kwantum Institute account.
-                    
-                    Click the following link to reset your password:
-                    {reset_url}
-                    
-                    This link will expire in 24 hours.
-                    
-                    If you did not request this reset, please ignore this email.
-                    
-                    Best regards,
-                    Kwantum Institute Team
-                    ''',
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[email],
-                    fail_silently=True,
-                )
-            except Exception as e:
-                logger.error(f"Failed to send password reset email: {e}")
-            
-            return Response({
-                'success': True,
-                'message': 'Password reset email sent successfully'
-            }, status=status.HTTP_200_OK)
+            # The lookup, token write and email run as one deferred job, so
+            # known and unknown addresses get the same response
+            request_password_reset(serializer.validated_data['email'])
+            response = Response(PASSWORD_RESET_REQUESTED, status=status.HTTP_200_OK)
         else:
-            return Response({
-                'success': False,
-                'message': 'Password reset request failed',
-                'errors': serializer.errors
-            }, status=status.HTTP_400_BAD_REQUEST)
+            response = Response(
+                {**PASSWORD_RESET_REQUEST_FAILED, 'errors': serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        # An inline job has finished by now; hold every response to the
+        # same fixed time so its duration does not show
+        pad_password_reset_response(self.started_at)
+        return response
 
 
 class PasswordResetConfirmView(APIView):
@@ -372,31 +450,37 @@ class PasswordResetConfirmView(APIView):
         )
         
         if serializer.is_valid():
-            token: str = serializer.validated_data['token']
-            new_password: str = serializer.validated_data['new_password']
-            
-            # Get the token object
-            token_obj: PasswordResetToken = PasswordResetToken.objects.get(token=token)
+            # Looked up with its user by PasswordResetConfirmSerializer
+            token_obj: PasswordResetToken = serializer.validated_data['token']
             user: User = token_obj.user
             
-            # Change the password
-            user.set_password(new_password)
-            user.save()
+            # Hash before opening the transaction so it stays short
+            user.set_password(serializer.validated_data['new_password'])
             
-            # Mark token as used
-            token_obj.is_used = True
-            token_obj.save()
+            with transaction.atomic():
+                # Claiming the token with a conditional UPDATE locks its row,
+                # so of two concurrent confirms only one gets past here
+                claimed: int = PasswordResetToken.objects.filter(
+                    pk=token_obj.pk, is_used=False
+                ).update(is_used=True)
+                if claimed:
+                    user.save(update_fields=['password'])
+            
+            if not claimed:
+                return Response(
+                    {**PASSWORD_RESET_FAILED, 'errors': {'token': [PASSWORD_RESET_TOKEN_INVALID]}},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             
             return Response({
                 'success': True,
                 'message': 'Password reset successful'
             }, status=status.HTTP_200_OK)
         else:
-            return Response({
-                'success': False,
-                'message': 'Password reset failed',
-                'errors': serializer.errors
-            }, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                {**PASSWORD_RESET_FAILED, 'errors': serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
 
 @api_view(['GET'])
@@ -411,20 +495,11 @@ def user_info(request) -> Response:
     Returns:
         Response with current user data
     """
-    user: User = request.user
-    
-    try:
-        profile: UserProfile = user.profile
-        profile_serializer: UserProfileSerializer = UserProfileSerializer(profile)
-        profile_data: Dict[str, Any] = profile_serializer.data
-    except UserProfile.DoesNotExist:
-        profile: UserProfile = UserProfile.objects.create(user=user)
-        profile_serializer: UserProfileSerializer = UserProfileSerializer(profile)
-        profile_data: Dict[str, Any] = profile_serializer.data
+    profile_data: Dict[str, Any] = get_profile_payload(get_request_profile(request))
     
     return Response({
         'success': True,
-        'user': UserSerializer(user).data,
+        'user': profile_data['user'],
         'profile': profile_data,
     }, status=status.HTTP_200_OK)
 
@@ -435,6 +510,10 @@ def check_auth(request) -> Response:
     """
     Check if user is authenticated.
     
+    Authenticated responses carry an ETag over the user payload, so a
+    polling client that sends ``If-None-Match`` gets an empty 304 until
+    the user changes.
+    
     Args:
         request: HTTP request object
         
@@ -442,29 +521,35 @@ def check_auth(request) -> Response:
         Response with authentication status
     """
     if request.user.is_authenticated:
-        return Response({
-            'authenticated': True,
-            'user': UserSerializer(request.user).data
-        }, status=status.HTTP_200_OK)
+        user_data: Dict[str, Any] = serialize_user(request.user)
+        etag: str = _payload_etag(user_data)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response: Response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({
+                'authenticated': True,
+                'user': user_data
+            }, status=status.HTTP_200_OK)
+        response['ETag'] = etag
+        # Revalidate on every poll; the body depends on the credentials
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ('Authorization', 'Cookie'))
+        return response
     else:
         return Response({
             'authenticated': False
         }, status=status.HTTP_401_UNAUTHORIZED)
 
 
-def _get_client_ip(request) -> str:
+def _payload_etag(payload: Dict[str, Any]) -> str:
     """
-    Get the client's IP address from the request.
+    Build a strong ETag for a JSON-serializable payload.
     
     Args:
-        request: HTTP request object
+        payload: Response data
         
     Returns:
-        Client's IP address as string
+        Quoted ETag value
     """
-    x_forwarded_for: str = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip: str = x_forwarded_for.split(',')[0]
-    else:
-        ip: str = request.META.get('REMOTE_ADDR')
-    return ip 
\ No newline at end of file
+    encoded: bytes = json.dumps(payload, sort_keys=True, default=str).encode()
+    return quote_etag(hashlib.sha256(encoded).hexdigest()[:32])
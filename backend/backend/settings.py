@@ -170,6 +170,21 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Joins UserProfile onto every user lookup made during login and session auth
+AUTHENTICATION_BACKENDS = [
+    'authentication.backends.ProfileModelBackend',
+]
+
+# Hash new passwords with Argon2 (argon2-cffi is in both requirements files);
+# the other hashers still verify existing hashes, upgraded on next login
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
@@ -205,7 +220,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'authentication.authentication.ProfileTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -213,6 +228,18 @@ REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
     ],
+    # Used by authentication.throttling; windows like 15m are allowed. Counters
+    # live in the default cache, so REDIS_URL is needed for the limits to hold
+    # across workers (check --deploy warns otherwise, as authentication.W001)
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': config('THROTTLE_LOGIN_IP', default='20/15m'),
+        'login_username': config('THROTTLE_LOGIN_USERNAME', default='5/15m'),
+        'register_ip': config('THROTTLE_REGISTER_IP', default='20/15m'),
+        'password_reset_ip': config('THROTTLE_PASSWORD_RESET_IP', default='20/15m'),
+        'password_reset_email': config('THROTTLE_PASSWORD_RESET_EMAIL', default='5/15m'),
+    },
+    # Reverse proxies that append to X-Forwarded-For; 0 trusts only REMOTE_ADDR
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
 }
 
 # CORS settings. Production is same-origin by default; explicitly opt in any
@@ -248,6 +275,19 @@ DEFAULT_FROM_EMAIL = 'noreply@kwantuminstitute.com'
 # Frontend URL for password reset links
 FRONTEND_URL = 'http://localhost:3000'
 
+# Hand reset emails and LoginAttempt writes to in-process worker threads.
+# Off by default: a serverless instance may be frozen once the response is
+# sent, so work left on a thread could be delayed or lost
+AUTH_BACKGROUND_WORKERS = _env_bool("AUTH_BACKGROUND_WORKERS", default=False)
+
+# Seconds every password reset request takes when AUTH_BACKGROUND_WORKERS is
+# off, so emailing a known address is not slower than ignoring an unknown
+# one. Keep it above the slowest SMTP send; overruns are logged. 0 disables
+PASSWORD_RESET_RESPONSE_TIME = config('PASSWORD_RESET_RESPONSE_TIME', default=3.0, cast=float)
+
+# Upper bound on cached check-auth user payloads; also invalidated on write
+USER_CACHE_TTL = config('USER_CACHE_TTL', default=60, cast=int)
+
 # ---------------------------------------------------------------------------
 # Science search middleware
 # ---------------------------------------------------------------------------
@@ -261,7 +301,8 @@ SCIENCE_SEARCH_POLITE_EMAIL = config(
     default='noreply@kwantuminstitute.com',
 )
 
-# Prefer Redis when REDIS_URL is set; otherwise use local memory cache.
+# Prefer Redis when REDIS_URL is set; otherwise use local memory cache, which
+# is private to each process and so only suits a single local server.
 REDIS_URL = config('REDIS_URL', default='')
 if REDIS_URL:
     CACHES = {